@@ -13,14 +13,50 @@ import os
 import ssl
 import certifi
 import aiohttp
-from datetime import datetime
 from pathlib import Path
+from dataclasses import dataclass
 from typing import Optional, Callable
 import logging
 import uuid
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+try:
+    import orjson  # 선택 의존성: 설치되어 있으면 JSON 처리에 사용
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data: bytes):
+    """JSON 역직렬화 (orjson은 bytes를 디코딩 없이 바로 파싱)"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8', errors='replace'))
+
+
+def _parse_lines(lines: list[bytes]) -> list[tuple[Optional[dict], bytes]]:
+    """여러 줄을 한 번에 파싱 (JSON이 아닌 줄은 data=None)"""
+    parsed = []
+    for line in lines:
+        try:
+            parsed.append((_json_loads(line), line))
+        except json.JSONDecodeError:
+            parsed.append((None, line))
+    return parsed
+
+
+def _json_dumps(obj) -> bytes:
+    """JSON 직렬화 (bytes 반환)"""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
 
 # macOS SSL 인증서 문제 해결
-ssl_context = ssl.create_default_context(cafile=certifi.where())
+# CA 번들을 한 번만 읽어 메모리 버퍼로 컨텍스트 생성 (재생성 시 파일 재조회 없음)
+CA_BUNDLE = Path(certifi.where()).read_text(encoding='utf-8')
+ssl_context = ssl.create_default_context(cadata=CA_BUNDLE)
 
 # 로깅 설정
 logging.basicConfig(
@@ -29,6 +65,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 디렉토리 확인 전용 스레드 풀 (느린 네트워크 마운트의 stat이 루프를 막지 않도록)
+# asyncio.to_thread의 contextvars 복사 오버헤드 없이 run_in_executor로 직접 사용
+_isdir_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="isdir")
+
+
+# 존재가 확인된 디렉토리 캐시: path -> 확인 시각
+# (없는 경로는 캐시하지 않음 - !설정 직후 디렉토리를 만들고 다시 시도하는 경우를 막지 않도록)
+_isdir_cache: dict[str, float] = {}
+
+
+async def isdir_async(path: str, ttl: float = 5.0) -> bool:
+    """이벤트 루프 밖에서 os.path.isdir 실행 (존재하는 경로는 ttl초 동안 결과 재사용)"""
+    now = time.monotonic()
+    checked = _isdir_cache.get(path)
+    if checked is not None and now - checked < ttl:
+        return True
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(_isdir_executor, os.path.isdir, path)
+    if result:
+        _isdir_cache[path] = now
+    else:
+        _isdir_cache.pop(path, None)
+    return result
+
 
 # ============== 디스코드 UI 컴포넌트 ==============
 
@@ -80,7 +140,9 @@ class UserInputModal(ui.Modal):
         self.add_item(self.answer_input)
 
     async def on_submit(self, interaction: discord.Interaction):
-        await interaction.response.send_message(f"📝 답변 전송됨: {self.answer_input.value[:100]}...", ephemeral=True)
+        answer = self.answer_input.value
+        shown = answer if len(answer) <= 100 else answer[:100] + "..."
+        await interaction.response.send_message(f"📝 답변 전송됨: {shown}", ephemeral=True)
         await self.session.send_user_message(self.answer_input.value)
 
 
@@ -103,6 +165,12 @@ class AnswerButton(ui.View):
 class ClaudeSession:
     """Claude Code 프로세스 세션 관리"""
 
+    STDIN_DRAIN_THRESHOLD = 4096  # 이 이상 쌓이면 drain으로 흐름 제어
+    OFFLOAD_PARSE_THRESHOLD = 16384  # 이 이상 읽은 청크는 스레드에서 파싱
+    PREVIEW_LENGTH = 800  # 상태 임베드 실시간 출력 미리보기 길이
+    IDLE_TIMEOUT = 600  # 출력 없이 이 시간(초)이 지나면 종료 (10분)
+    PIPE_WAIT = 3  # 종료 후 파이프가 닫히기를 기다릴 최대 시간 (초)
+
     def __init__(self, directory: str, channel: discord.TextChannel, status_msg: discord.Message):
         self.session_id = str(uuid.uuid4())[:8]
         self.directory = directory
@@ -111,16 +179,44 @@ class ClaudeSession:
         self.process: Optional[asyncio.subprocess.Process] = None
         self.is_running = False
         self.is_waiting_input = False
-        self.current_content = ""
+        # 스트리밍 텍스트는 조각 리스트로 누적 (str += 반복 재할당 방지)
+        self._content_parts: list[str] = []
+        self._content_len = 0
+        self._preview: deque[str] = deque(maxlen=self.PREVIEW_LENGTH)  # 미리보기용 마지막 800자
         self.current_tool = None
         self.full_output = []
-        self.start_time = datetime.now()
-        self.last_update = datetime.now()
+        self.start_time = time.monotonic()  # 경과 시간 측정용 (벽시계 변경 영향 없음)
+        self.last_update = time.monotonic()  # 마지막 상태 갱신 시각
         self._permission_future: Optional[asyncio.Future] = None
+        self.prompt_display = ""  # 표시용 프롬프트 (시작 시 한 번만 잘라 둠)
+        self._suppress_status = False  # True면 스트림 배치 처리 중 (상태 갱신 보류)
+        self._stdin_unflushed = 0  # drain 이후 stdin에 쓴 바이트 수
+        self._last_byte_mono = 0.0  # 마지막으로 stdout을 받은 시각
+        self._timed_out = False  # 유휴 감시로 종료되었는지 여부
+        self._aborted = False  # !중단으로 종료되었는지 여부
+        self._edit_event = asyncio.Event()  # 보낼 상태 갱신이 있음을 알림
+        self._editor_task: Optional[asyncio.Task] = None
+        self._editor_closing = False
+        # 메시지 타입 -> 핸들러 (사용자 입력/퍼미션 요청 감지 포함)
+        self._handlers = {
+            "assistant": self._handle_assistant,
+            "content_block_delta": self._handle_delta,
+            "content_block_start": self._handle_block_start,
+            "content_block_stop": self._handle_block_stop,
+            "result": self._handle_result,
+            "user_input_request": self._handle_input_request,
+            "permission_request": self._handle_permission_request,
+        }
+
+        # 상태 임베드 (필드 배치를 미리 구성해 두고 갱신 시 값만 교체)
+        self._status_embed = discord.Embed(title="🔄 Claude Code 실행 중...", color=discord.Color.yellow())
+        self._status_embed.add_field(name="상태", value="-", inline=True)
+        self._status_embed.add_field(name="경과", value="-", inline=True)
 
     async def start(self, prompt: str) -> tuple[bool, str]:
         """세션 시작 및 프롬프트 실행"""
-        if not os.path.isdir(self.directory):
+        self.prompt_display = prompt if len(prompt) <= 50 else prompt[:50] + "..."
+        if not await isdir_async(self.directory):
             return False, f"❌ 디렉토리가 존재하지 않습니다: {self.directory}"
 
         try:
@@ -136,94 +232,198 @@ class ClaudeSession:
             )
 
             self.is_running = True
-            self.start_time = datetime.now()
+            self.start_time = time.monotonic()
+            self._editor_task = asyncio.create_task(self._editor_loop())
 
             # 스트림 읽기 시작
             result = await self._read_stream()
 
-            return True, result
+            # 시간 초과/중단으로 끝난 출력은 불완전하므로 실패로 처리 (응답 캐시에도 남지 않음)
+            return not (self._timed_out or self._aborted), result
 
         except FileNotFoundError:
             return False, "❌ Claude Code CLI가 설치되지 않았습니다."
         except Exception as e:
-            logger.error(f"세션 시작 오류: {e}")
+            logger.error("세션 시작 오류: %s", e)
             return False, f"❌ 실행 오류: {str(e)}"
         finally:
             self.is_running = False
+            await self._stop_editor()
 
     async def _read_stream(self) -> str:
         """스트림 읽기 및 처리"""
+        # stderr를 stdout과 동시에 비워 파이프가 가득 차 프로세스가 멈추는 것을 방지
+        stderr_task = asyncio.create_task(self._drain_stderr())
+        # 줄 단위 readline 대신 큰 청크로 읽고 버퍼에서 줄을 분리 (await 횟수 감소,
+        # StreamReader의 64KB 줄 길이 제한도 받지 않음)
+        buf = bytearray()
+        # 읽기마다 wait_for로 감싸지 않고, 감시 태스크 하나가 유휴 시간을 확인
+        self._timed_out = False
+        self._last_byte_mono = time.monotonic()
+        watchdog = asyncio.create_task(self._idle_watchdog(self.IDLE_TIMEOUT))
+        read: Optional[asyncio.Future] = None
         try:
             while True:
-                line = await asyncio.wait_for(
-                    self.process.stdout.readline(),
-                    timeout=600  # 10분 타임아웃
-                )
+                read = asyncio.ensure_future(self.process.stdout.read(65536))
+                # 하위 프로세스가 파이프를 쥐고 있으면 종료 후에도 EOF가 오지 않으므로 감시 태스크와 경합
+                await asyncio.wait((read, watchdog), return_when=asyncio.FIRST_COMPLETED)
+                if not read.done():
+                    read.cancel()
+                    await watchdog  # 감시 태스크 안의 예외를 여기서 전파
+                    break
+                chunk = read.result()
 
-                if not line:
+                if not chunk:
                     break
 
-                await self._process_line(line)
+                self._last_byte_mono = time.monotonic()
+                buf += chunk
+                lines = []
+                start = 0
+                while (nl := buf.find(b"\n", start)) >= 0:
+                    lines.append(buf[start:nl])
+                    start = nl + 1
+                del buf[:start]
+
+                # 큰 배치는 파싱을 스레드로 넘겨 (배치당 한 번의 전환) 루프를 비워 둠
+                if len(chunk) >= self.OFFLOAD_PARSE_THRESHOLD:
+                    parsed = await asyncio.get_running_loop().run_in_executor(None, _parse_lines, lines)
+                else:
+                    parsed = _parse_lines(lines)
+
+                # 배치 처리 중에는 줄마다 상태를 갱신하지 않고 배치 끝에서 한 번만 갱신
+                self._suppress_status = True
+                try:
+                    for data, line in parsed:
+                        await self._handle_parsed(data, line)
+                finally:
+                    self._suppress_status = False
+                await self._update_status()
 
-            await self.process.wait()
-            return "\n".join(self.full_output) if self.full_output else self.current_content
+            # 감시 태스크가 종료시킨 경우에도 종료 직전까지 버퍼된 출력은 반영
+            if buf:
+                await self._process_line(buf)
 
+            if not self._timed_out:
+                await self._wait_exit()
+            output = "\n".join(self.full_output) if self.full_output else self.current_content
+            if self._timed_out:
+                return f"⏰ 작업 시간 초과\n{output}" if output else "⏰ 작업 시간 초과"
+            return output
+
+        finally:
+            if read and not read.done():
+                read.cancel()
+            if not watchdog.done():
+                watchdog.cancel()
+            elif not watchdog.cancelled() and watchdog.exception():
+                logger.error("[%s] 유휴 감시 오류: %s", self.session_id, watchdog.exception())
+            if self.process.returncode is None:
+                stderr_task.cancel()
+            else:
+                try:
+                    stderr = await asyncio.wait_for(stderr_task, timeout=self.PIPE_WAIT)
+                except asyncio.TimeoutError:
+                    stderr = b""  # wait_for가 태스크를 취소함
+                # 정상 종료에도 CLI가 stderr를 쓰므로 경고는 실패했을 때만, 그 외에는 DEBUG로 기록
+                level = logging.WARNING if self.process.returncode != 0 else logging.DEBUG
+                if stderr and logger.isEnabledFor(level):
+                    logger.log(level, "[%s] stderr: %.500s", self.session_id, stderr.decode('utf-8', errors='replace'))
+
+    async def _idle_watchdog(self, timeout: float):
+        """마지막 출력 이후 timeout초 동안 출력이 없으면 프로세스 종료"""
+        while True:
+            remaining = self._last_byte_mono + timeout - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(remaining)
+        self._timed_out = True
+        logger.warning("[%s] %.0f초 동안 출력 없음 - 종료", self.session_id, timeout)
+        await self._terminate()
+
+    async def _terminate(self, grace: float = 3.0):
+        """SIGTERM으로 출력 플러시 기회를 준 뒤, 유예 시간 내 종료되지 않으면 SIGKILL"""
+        if self.process.returncode is not None:
+            return
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=grace)
         except asyncio.TimeoutError:
-            self.process.kill()
-            await self.process.wait()
-            return "⏰ 작업 시간 초과"
+            # wait()는 파이프가 닫힐 때까지 기다리므로 종료 코드가 이미 있으면 kill 불필요
+            if self.process.returncode is None:
+                self.process.kill()
+                await self._wait_exit()
+
+    async def _wait_exit(self):
+        """프로세스 종료 대기 (파이프를 쥔 하위 프로세스가 있어도 종료 코드가 나오면 반환)"""
+        while True:
+            try:
+                return await asyncio.wait_for(self.process.wait(), timeout=self.PIPE_WAIT)
+            except asyncio.TimeoutError:
+                if self.process.returncode is not None:
+                    return self.process.returncode
+
+    async def _drain_stderr(self) -> bytes:
+        """stderr 스트림을 청크 단위로 읽어 누적"""
+        buf = bytearray()
+        while True:
+            chunk = await self.process.stderr.read(65536)
+            if not chunk:
+                return bytes(buf)
+            buf += chunk
 
     async def _process_line(self, line: bytes):
         """한 줄 처리"""
-        try:
-            data = json.loads(line.decode('utf-8', errors='replace'))
-            msg_type = data.get("type", "")
-
-            logger.debug(f"[{self.session_id}] 메시지 타입: {msg_type}")
-
-            if msg_type == "assistant":
-                await self._handle_assistant(data)
+        for data, raw in _parse_lines([line]):
+            await self._handle_parsed(data, raw)
 
-            elif msg_type == "content_block_delta":
-                await self._handle_delta(data)
+    async def _handle_parsed(self, data: Optional[dict], line: bytes):
+        """파싱된 메시지 처리 (data가 None이면 JSON이 아닌 텍스트 줄)"""
+        if data is None:
+            text = line.decode('utf-8', errors='replace').strip()
+            if text:
+                self._append_content(text + "\n")
+                await self._update_status()
+            return
 
-            elif msg_type == "content_block_start":
-                await self._handle_block_start(data)
+        msg_type = data.get("type", "")
 
-            elif msg_type == "content_block_stop":
-                self.current_tool = None
+        logger.debug("[%s] 메시지 타입: %s", self.session_id, msg_type)
 
-            elif msg_type == "result":
-                await self._handle_result(data)
+        # elif 체인 대신 메시지 타입별 핸들러 테이블로 분기
+        handler = self._handlers.get(msg_type)
+        if handler:
+            await handler(data)
 
-            # 사용자 입력 요청 감지
-            elif msg_type == "user_input_request":
-                await self._handle_input_request(data)
+    @property
+    def current_content(self) -> str:
+        return "".join(self._content_parts)
 
-            # 퍼미션 요청 감지
-            elif msg_type == "permission_request":
-                await self._handle_permission_request(data)
+    def _set_content(self, text: str):
+        self._content_parts = [text]
+        self._content_len = len(text)
+        self._preview.clear()
+        self._preview.extend(text[-self.PREVIEW_LENGTH:])
 
-        except json.JSONDecodeError:
-            text = line.decode('utf-8', errors='replace').strip()
-            if text:
-                self.current_content += text + "\n"
-                await self._update_status()
+    def _append_content(self, text: str):
+        self._content_parts.append(text)
+        self._content_len += len(text)
+        # 미리보기 창은 maxlen deque가 앞쪽을 자동으로 버림
+        self._preview.extend(text[-self.PREVIEW_LENGTH:])
 
     async def _handle_assistant(self, data: dict):
         """어시스턴트 메시지 처리"""
         content = data.get("message", {}).get("content", [])
         for block in content:
             if block.get("type") == "text":
-                self.current_content = block.get("text", "")
+                self._set_content(block.get("text", ""))
                 await self._update_status()
 
     async def _handle_delta(self, data: dict):
         """스트리밍 델타 처리"""
         delta = data.get("delta", {})
         if delta.get("type") == "text_delta":
-            text = delta.get("text", "")
-            self.current_content += text
+            self._append_content(delta.get("text", ""))
             await self._update_status()
 
     async def _handle_block_start(self, data: dict):
@@ -233,6 +433,10 @@ class ClaudeSession:
             self.current_tool = block.get("name", "도구 실행")
             await self._update_status()
 
+    async def _handle_block_stop(self, data: dict):
+        """컨텐츠 블록 종료"""
+        self.current_tool = None
+
     async def _handle_result(self, data: dict):
         """최종 결과 처리"""
         result_text = data.get("result", "")
@@ -276,6 +480,14 @@ class ClaudeSession:
         except asyncio.TimeoutError:
             await self.send_permission_response(False)
 
+    async def _write_stdin(self, data: bytes):
+        """stdin 쓰기 (미전송 바이트가 임계값을 넘을 때만 drain)"""
+        self.process.stdin.write(data)
+        self._stdin_unflushed += len(data)
+        if self._stdin_unflushed >= self.STDIN_DRAIN_THRESHOLD:
+            await self.process.stdin.drain()
+            self._stdin_unflushed = 0
+
     async def send_permission_response(self, allowed: bool, allow_all: bool = False):
         """퍼미션 응답 전송"""
         if self.process and self.process.stdin:
@@ -284,8 +496,7 @@ class ClaudeSession:
                 "allowed": allowed,
                 "allow_all": allow_all
             }
-            self.process.stdin.write((json.dumps(response) + "\n").encode())
-            await self.process.stdin.drain()
+            await self._write_stdin(_json_dumps(response) + b"\n")
 
         self.is_waiting_input = False
         if self._permission_future and not self._permission_future.done():
@@ -301,131 +512,300 @@ class ClaudeSession:
                     "content": message
                 }
             }
-            self.process.stdin.write((json.dumps(user_msg) + "\n").encode())
-            await self.process.stdin.drain()
+            await self._write_stdin(_json_dumps(user_msg) + b"\n")
 
         self.is_waiting_input = False
         await self._update_status(f"📝 답변 전송됨")
 
     async def _update_status(self, extra_status: str = None):
         """상태 메시지 업데이트"""
-        now = datetime.now()
-        elapsed = (now - self.last_update).total_seconds()
+        if self._suppress_status and extra_status is None:
+            return
 
-        # rate limit 방지: 1.5초 간격
-        if elapsed < 1.5:
+        # rate limit 방지: 1.5초 간격 (임베드 구성 전에 판단, 명시적 상태 메시지는 즉시 반영)
+        now = time.monotonic()
+        if now - self.last_update < 1.5 and not extra_status:
             return
 
         self.last_update = now
 
-        try:
-            # 상태 표시
-            if extra_status:
-                status = extra_status
-            elif self.is_waiting_input:
-                status = "⏳ 사용자 입력 대기 중..."
-            elif self.current_tool:
-                status = f"🔧 {self.current_tool}"
-            else:
-                status = "💭 응답 생성 중..."
-
-            # 컨텐츠 미리보기 (최대 800자)
-            preview = self.current_content[-800:] if len(self.current_content) > 800 else self.current_content
-            if len(self.current_content) > 800:
-                preview = "...\n" + preview
+        # 상태 표시
+        if extra_status:
+            status = extra_status
+        elif self.is_waiting_input:
+            status = "⏳ 사용자 입력 대기 중..."
+        elif self.current_tool:
+            status = f"🔧 {self.current_tool}"
+        else:
+            status = "💭 응답 생성 중..."
 
-            embed = discord.Embed(
-                title="🔄 Claude Code 실행 중...",
-                color=discord.Color.yellow()
-            )
-            embed.add_field(name="상태", value=status, inline=True)
+        # 컨텐츠 미리보기 (최대 800자, 전체 내용과 무관하게 고정 크기 창에서 생성)
+        preview = "".join(self._preview)
+        if self._content_len > self.PREVIEW_LENGTH:
+            preview = "...\n" + preview
 
-            elapsed_time = (now - self.start_time).total_seconds()
-            embed.add_field(name="경과", value=f"{elapsed_time:.1f}초", inline=True)
+        # 세션당 하나의 임베드를 재사용하고 필드 값만 교체
+        embed = self._status_embed
+        embed.set_field_at(0, name="상태", value=status, inline=True)
 
-            if preview.strip():
-                embed.add_field(
-                    name="실시간 출력",
-                    value=f"```\n{preview[:1000]}\n```",
-                    inline=False
-                )
+        elapsed_time = now - self.start_time
+        embed.set_field_at(1, name="경과", value=f"{elapsed_time:.1f}초", inline=True)
 
-            await self.status_msg.edit(embed=embed)
+        has_preview = len(embed.fields) > 2
+        if preview.strip():
+            value = f"```\n{preview[:1000]}\n```"
+            if has_preview:
+                embed.set_field_at(2, name="실시간 출력", value=value, inline=False)
+            else:
+                embed.add_field(name="실시간 출력", value=value, inline=False)
+        elif has_preview:
+            embed.remove_field(2)
+
+        # 실제 전송은 편집 태스크에 맡겨 읽기 루프가 HTTP 왕복을 기다리지 않게 함
+        self._edit_event.set()
+
+    async def _editor_loop(self):
+        """상태 임베드 편집 전담 태스크 (대기 중 쌓인 갱신은 최신 상태 한 번으로 합쳐짐)"""
+        while True:
+            await self._edit_event.wait()
+            self._edit_event.clear()
+            if self._editor_closing:
+                return
+            try:
+                await self.status_msg.edit(embed=self._status_embed)
+            except discord.HTTPException as e:
+                logger.warning("상태 업데이트 실패: %s", e)
 
-        except discord.HTTPException as e:
-            logger.warning(f"상태 업데이트 실패: {e}")
+    async def _stop_editor(self):
+        """편집 태스크 종료 (진행 중인 편집은 끝까지 기다려 최종 결과를 덮어쓰지 않도록 함)"""
+        if self._editor_task is None:
+            return
+        self._editor_closing = True
+        self._edit_event.set()
+        await self._editor_task
+        self._editor_task = None
 
     async def abort(self):
         """세션 중단"""
+        self._aborted = True
         if self.process:
             self.process.kill()
-            await self.process.wait()
+            await self._wait_exit()
         self.is_running = False
 
 
 # ============== 기존 매니저 클래스들 ==============
 
+@dataclass(slots=True)
+class ChannelState:
+    """채널별 상태"""
+    session: Optional[ClaudeSession] = None
+
+
 class ChannelLockManager:
     """채널별 락 및 세션 관리"""
 
     def __init__(self):
-        self._locks: dict[int, asyncio.Lock] = {}
-        self._sessions: dict[int, ClaudeSession] = {}
+        self._state: defaultdict[int, ChannelState] = defaultdict(ChannelState)
+        self._busy: set[int] = set()
+
+    def get_state(self, channel_id: int) -> ChannelState:
+        """채널 상태 조회 (없으면 생성)"""
+        return self._state[channel_id]
+
+    def try_acquire(self, channel_id: int) -> bool:
+        """채널 선점 시도 (이미 실행 중이면 False)"""
+        if channel_id in self._busy:
+            return False
+        self._busy.add(channel_id)
+        return True
 
-    def get_lock(self, channel_id: int) -> asyncio.Lock:
-        if channel_id not in self._locks:
-            self._locks[channel_id] = asyncio.Lock()
-        return self._locks[channel_id]
+    def release(self, channel_id: int):
+        self._busy.discard(channel_id)
+
+    @property
+    def busy_channels(self) -> set[int]:
+        """실행 중인 채널 ID 집합 (읽기 전용으로 사용)"""
+        return self._busy
 
     def get_session(self, channel_id: int) -> Optional[ClaudeSession]:
-        return self._sessions.get(channel_id)
+        state = self._state.get(channel_id)
+        return state.session if state else None
 
     def set_session(self, channel_id: int, session: ClaudeSession):
-        self._sessions[channel_id] = session
+        self.get_state(channel_id).session = session
 
     def clear_session(self, channel_id: int):
-        if channel_id in self._sessions:
-            del self._sessions[channel_id]
+        # 세션이 끝난 채널의 상태 레코드는 제거해 장기 실행 시 메모리가 계속 늘지 않게 함
+        state = self._state.pop(channel_id, None)
+        if state:
+            state.session = None
 
     def is_running(self, channel_id: int) -> bool:
-        session = self._sessions.get(channel_id)
+        session = self.get_session(channel_id)
         return session.is_running if session else False
 
 
+class ResponseCache:
+    """(채널, 디렉토리, 프롬프트) -> 결과 LRU 캐시 (채널별 opt-in, 짧은 TTL)"""
+
+    def __init__(self, maxsize: int = 64, ttl: float = 60.0, max_output: int = 128 * 1024):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_output = max_output
+        self._cache: OrderedDict[tuple[int, str, str], tuple[float, str]] = OrderedDict()
+
+    def get(self, channel_id: int, directory: str, prompt: str) -> Optional[str]:
+        key = (channel_id, directory, prompt)
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        ts, output = entry
+        if time.monotonic() - ts >= self.ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return output
+
+    def put(self, channel_id: int, directory: str, prompt: str, output: str):
+        if len(output) > self.max_output:
+            return
+        key = (channel_id, directory, prompt)
+        self._cache[key] = (time.monotonic(), output)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, channel_id: int):
+        for key in [k for k in self._cache if k[0] == channel_id]:
+            del self._cache[key]
+
+
 class ConfigManager:
-    """설정 파일 관리"""
+    """설정 파일 관리 (메모리 캐시 + 지연 저장)"""
+
+    SAVE_DELAY = 0.5  # 저장 디바운스 간격 (초)
 
     def __init__(self, config_path: str = "config.json"):
         self.config_path = config_path
         self.config = self._load_config()
+        # 채널 ID(int) -> 디렉토리 캐시 (메시지마다 str 변환 방지)
+        self._mappings: dict[int, str] = {
+            int(k): v for k, v in self.config.get("channel_mappings", {}).items()
+        }
+        # 매핑된 채널 ID 집합 (_mappings의 라이브 뷰, 별도 동기화 불필요)
+        self.mapped_channels = self._mappings.keys()
+        self._dirty = False
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._save_task: Optional[asyncio.Task] = None
 
     def _load_config(self) -> dict:
-        if os.path.exists(self.config_path):
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        path = Path(self.config_path)
+        if path.exists():
+            data = path.read_bytes()
+            return orjson.loads(data) if orjson else json.loads(data)
         return {"channel_mappings": {}, "settings": {}}
 
+    @staticmethod
+    def _dump_config(config: dict) -> bytes:
+        if orjson:
+            return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+        return json.dumps(config, indent=2, ensure_ascii=False).encode('utf-8')
+
+    def _snapshot(self) -> dict:
+        # 이 클래스가 수정하는 것은 channel_mappings뿐이므로 그 딕셔너리만 복사
+        return {**self.config, "channel_mappings": dict(self.config.get("channel_mappings", {}))}
+
     def save_config(self):
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, indent=2, ensure_ascii=False)
+        """변경 표시 후 디바운스 저장 예약 (루프 밖에서는 즉시 저장)"""
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._dirty = False
+            self._write_sync(self.config)
+            return
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(self.SAVE_DELAY, self._flush_soon)
+
+    def _flush_soon(self):
+        self._save_handle = None
+        # 진행 중인 저장이 있으면 해당 태스크가 dirty 상태를 이어서 처리
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._write_pending())
+
+    async def _write_pending(self):
+        while self._dirty:
+            self._dirty = False
+            # 루프에서는 얕은 스냅샷만 뜨고, 직렬화와 파일 쓰기는 모두 스레드에서
+            await asyncio.to_thread(self._write_sync, self._snapshot())
+
+    def _write_sync(self, config: dict):
+        tmp_path = Path(f"{self.config_path}.tmp")
+        tmp_path.write_bytes(self._dump_config(config))
+        os.replace(tmp_path, self.config_path)
+
+    async def flush(self):
+        """대기 중인 변경 사항을 즉시 디스크에 기록"""
+        if self._save_handle:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._save_task and not self._save_task.done():
+            await self._save_task
+        await self._write_pending()
 
     def get_directory(self, channel_id: int) -> Optional[str]:
-        return self.config.get("channel_mappings", {}).get(str(channel_id))
+        return self._mappings.get(channel_id)
 
     def set_directory(self, channel_id: int, directory: str):
+        # 같은 경로로 다시 설정하면 파일을 다시 쓰지 않음
+        if self._mappings.get(channel_id) == directory:
+            return
         if "channel_mappings" not in self.config:
             self.config["channel_mappings"] = {}
         self.config["channel_mappings"][str(channel_id)] = directory
+        self._mappings[channel_id] = directory
         self.save_config()
 
     def remove_directory(self, channel_id: int):
-        if str(channel_id) in self.config.get("channel_mappings", {}):
-            del self.config["channel_mappings"][str(channel_id)]
+        if channel_id in self._mappings:
+            del self._mappings[channel_id]
+            self.config["channel_mappings"].pop(str(channel_id), None)
             self.save_config()
 
     def get_all_mappings(self) -> dict:
         return self.config.get("channel_mappings", {})
 
+    def get_mappings_by_id(self) -> dict[int, str]:
+        """int 채널 ID 기준 매핑 (읽기 전용으로 사용)"""
+        return self._mappings
+
+
+# ============== 정적 메시지 ==============
+
+BUSY_REPLY = "⏳ **작업이 실행 중입니다.** 완료 후 다시 시도하세요."
+
+# 매 호출마다 동일한 임베드를 다시 만들지 않도록 모듈 로드 시 한 번만 생성
+HELP_EMBED = discord.Embed(
+    title="🤖 Claude Code 봇",
+    description="디스코드에서 Claude Code를 실행합니다.\n퍼미션 요청, 추가 질문에 응답할 수 있습니다.",
+    color=discord.Color.purple()
+)
+HELP_EMBED.add_field(name="!설정 <경로>", value="채널-디렉토리 연결", inline=False)
+HELP_EMBED.add_field(name="!해제", value="연결 해제", inline=False)
+HELP_EMBED.add_field(name="!중단", value="현재 실행 중단", inline=False)
+HELP_EMBED.add_field(name="!캐시 [on/off]", value="동일 프롬프트 응답 캐시 설정", inline=False)
+HELP_EMBED.add_field(name="!정보", value="채널 정보 확인", inline=False)
+HELP_EMBED.add_field(name="!목록", value="모든 매핑 표시", inline=False)
+
+# 채널 정보: 동적 필드는 copy() 후 추가
+INFO_EMBED_TEMPLATE = discord.Embed(title="📁 채널 정보", color=discord.Color.blue())
+INFO_UNMAPPED_EMBED = discord.Embed(
+    title="📁 채널 정보",
+    description="`!설정 /path/to/directory` 로 설정하세요.",
+    color=discord.Color.blue()
+)
+
 
 # ============== 메인 봇 클래스 ==============
 
@@ -445,6 +825,8 @@ class ClaudeDiscordBot(commands.Bot):
 
         self.config_manager = ConfigManager(config_path)
         self.session_manager = ChannelLockManager()
+        self.response_cache = ResponseCache()
+        self._cache_channels: set[int] = set()  # 응답 캐시를 켠 채널
         self._register_commands()
 
     def _register_commands(self):
@@ -452,17 +834,21 @@ class ClaudeDiscordBot(commands.Bot):
 
         @self.command(name="설정")
         async def set_directory(ctx, *, directory: str):
-            directory = os.path.expanduser(directory.strip())
-            if not os.path.isdir(directory):
+            # 한 번 정규화한 경로 문자열을 검사/저장/응답에 재사용
+            directory = str(Path(directory.strip()).expanduser())
+            if not await isdir_async(directory):
                 await ctx.send(f"❌ 디렉토리가 존재하지 않습니다: `{directory}`")
                 return
+            self.response_cache.invalidate(ctx.channel.id)
             self.config_manager.set_directory(ctx.channel.id, directory)
             await ctx.send(f"✅ 이 채널이 연결되었습니다:\n`{directory}`")
-            logger.info(f"채널 {ctx.channel.id} -> {directory} 매핑됨")
+            logger.info("채널 %s -> %s 매핑됨", ctx.channel.id, directory)
 
         @self.command(name="해제")
         async def remove_directory(ctx):
-            if self.config_manager.get_directory(ctx.channel.id):
+            directory = self.config_manager.get_directory(ctx.channel.id)
+            if directory:
+                self.response_cache.invalidate(ctx.channel.id)
                 self.config_manager.remove_directory(ctx.channel.id)
                 await ctx.send("✅ 디렉토리 매핑이 해제되었습니다.")
             else:
@@ -479,23 +865,50 @@ class ClaudeDiscordBot(commands.Bot):
             else:
                 await ctx.send("❌ 실행 중인 세션이 없습니다.")
 
+        @self.command(name="캐시")
+        async def toggle_cache(ctx, mode: str = None):
+            """동일 프롬프트 응답 캐시 설정 (on/off)"""
+            enabled = ctx.channel.id in self._cache_channels
+            if mode is None:
+                status = "🟢 켜짐" if enabled else "🔴 꺼짐"
+                await ctx.send(
+                    f"**응답 캐시:** {status}\n"
+                    f"{int(self.response_cache.ttl)}초 안에 같은 프롬프트를 보내면 이전 결과를 재사용합니다.\n"
+                    f"변경: `!캐시 on` 또는 `!캐시 off` (메시지 앞에 `--fresh`를 붙이면 캐시 무시)"
+                )
+                return
+
+            mode = mode.lower()
+            if mode in ("on", "켜기"):
+                self._cache_channels.add(ctx.channel.id)
+                await ctx.send("✅ 응답 캐시가 켜졌습니다.")
+            elif mode in ("off", "끄기"):
+                self._cache_channels.discard(ctx.channel.id)
+                self.response_cache.invalidate(ctx.channel.id)
+                await ctx.send("✅ 응답 캐시가 꺼졌습니다.")
+            else:
+                await ctx.send("❌ 올바른 모드를 입력하세요: `on` 또는 `off`")
+
         @self.command(name="정보")
         async def show_info(ctx):
             directory = self.config_manager.get_directory(ctx.channel.id)
             session = self.session_manager.get_session(ctx.channel.id)
 
-            embed = discord.Embed(title="📁 채널 정보", color=discord.Color.blue())
+            if not directory:
+                await ctx.send(embed=INFO_UNMAPPED_EMBED)
+                return
 
-            if directory:
-                embed.add_field(name="연결된 디렉토리", value=f"`{directory}`", inline=False)
+            embed = INFO_EMBED_TEMPLATE.copy()
+            embed.add_field(name="연결된 디렉토리", value=f"`{directory}`", inline=False)
 
-                if session and session.is_running:
-                    status = "⏳ 입력 대기 중" if session.is_waiting_input else "🔄 실행 중"
-                else:
-                    status = "✅ 대기 중"
-                embed.add_field(name="상태", value=status, inline=True)
+            if session and session.is_running:
+                status = "⏳ 입력 대기 중" if session.is_waiting_input else "🔄 실행 중"
             else:
-                embed.description = "`!설정 /path/to/directory` 로 설정하세요."
+                status = "✅ 대기 중"
+            embed.add_field(name="상태", value=status, inline=True)
+
+            if session and session.is_running and session.prompt_display:
+                embed.add_field(name="현재 작업", value=f"`{session.prompt_display}`", inline=False)
 
             await ctx.send(embed=embed)
 
@@ -506,71 +919,91 @@ class ClaudeDiscordBot(commands.Bot):
                 await ctx.send("📭 등록된 매핑이 없습니다.")
                 return
 
+            busy = self.session_manager.busy_channels
+
             embed = discord.Embed(title="📋 채널-디렉토리 매핑", color=discord.Color.green())
-            for channel_id, directory in mappings.items():
-                channel = self.get_channel(int(channel_id))
-                channel_name = channel.name if channel else f"Unknown"
-                session = self.session_manager.get_session(int(channel_id))
-                status = "🔄" if session and session.is_running else "✅"
+            for channel_id, directory in self.config_manager.get_mappings_by_id().items():
+                channel = self.get_channel(channel_id)
+                channel_name = channel.name if channel else "Unknown"
+                status = "🔄" if channel_id in busy else "✅"
                 embed.add_field(name=f"{status} #{channel_name}", value=f"`{directory}`", inline=False)
 
             await ctx.send(embed=embed)
 
         @self.command(name="도움")
         async def show_help(ctx):
-            embed = discord.Embed(
-                title="🤖 Claude Code 봇",
-                description="디스코드에서 Claude Code를 실행합니다.\n퍼미션 요청, 추가 질문에 응답할 수 있습니다.",
-                color=discord.Color.purple()
-            )
-            embed.add_field(name="!설정 <경로>", value="채널-디렉토리 연결", inline=False)
-            embed.add_field(name="!해제", value="연결 해제", inline=False)
-            embed.add_field(name="!중단", value="현재 실행 중단", inline=False)
-            embed.add_field(name="!정보", value="채널 정보 확인", inline=False)
-            embed.add_field(name="!목록", value="모든 매핑 표시", inline=False)
-            await ctx.send(embed=embed)
+            await ctx.send(embed=HELP_EMBED)
+
+    async def close(self):
+        # 디바운스 중인 설정 저장을 마무리한 뒤 종료
+        await self.config_manager.flush()
+        await super().close()
 
     async def on_ready(self):
-        logger.info(f"봇 로그인: {self.user}")
-        logger.info(f"등록된 매핑: {len(self.config_manager.get_all_mappings())}개")
+        logger.info("봇 로그인: %s", self.user)
+        logger.info("등록된 매핑: %s개", len(self.config_manager.get_all_mappings()))
 
     async def on_message(self, message: discord.Message):
         if message.author.bot:
             return
 
-        if message.content.startswith("!"):
+        # 첫 글자 비교로 명령어 판별 (빈 메시지도 함께 걸러짐)
+        content = message.content
+        if content and content[0] == "!":
             await self.process_commands(message)
             return
 
-        directory = self.config_manager.get_directory(message.channel.id)
-        if not directory:
+        # 매핑되지 않은 채널(대부분의 메시지)은 해시 조회 한 번으로 종료
+        channel_id = message.channel.id
+        if channel_id not in self.config_manager.mapped_channels:
             return
 
+        directory = self.config_manager.get_directory(channel_id)
+
         # 현재 세션이 입력 대기 중이면 메시지를 세션에 전달
-        session = self.session_manager.get_session(message.channel.id)
+        session = self.session_manager.get_session(channel_id)
         if session and session.is_running and session.is_waiting_input:
-            await session.send_user_message(message.content)
+            await session.send_user_message(content)
             await message.add_reaction("📝")
             return
 
         # 이미 실행 중이면 대기 메시지
         if session and session.is_running:
-            await message.reply("⏳ **작업이 실행 중입니다.** 완료 후 다시 시도하세요.")
+            await message.reply(f"{BUSY_REPLY}\n현재 작업: `{session.prompt_display}`")
             return
 
-        # 새 세션 시작
-        await self._start_session(message, directory)
+        # 새 세션 시작 (--fresh 접두사는 캐시를 무시, "--freshness" 같은 단어는 그대로 둠)
+        prompt = content
+        use_cache = channel_id in self._cache_channels
+        parts = prompt.split(None, 1)
+        if parts and parts[0] == "--fresh":
+            prompt = parts[1] if len(parts) > 1 else ""
+            use_cache = False
+
+        if use_cache:
+            cached = self.response_cache.get(channel_id, directory, prompt)
+            if cached is not None:
+                await self._send_result(message, True, cached, 0.0, None, cached=True)
+                return
+
+        await self._start_session(message, directory, prompt, use_cache)
 
-    async def _start_session(self, message: discord.Message, directory: str):
+    async def _start_session(self, message: discord.Message, directory: str, prompt: str, use_cache: bool = False):
         """새 Claude 세션 시작"""
         channel_id = message.channel.id
-        lock = self.session_manager.get_lock(channel_id)
 
-        async with lock:
+        # 락 대신 busy 집합으로 선점 (await 없이 확인+등록하므로 루프 내에서 원자적)
+        if not self.session_manager.try_acquire(channel_id):
+            await message.reply(BUSY_REPLY)
+            return
+
+        state = self.session_manager.get_state(channel_id)
+
+        try:
             # 시작 메시지
             start_embed = discord.Embed(
                 title="🔄 Claude Code 실행 중...",
-                description=f"```{message.content[:200]}```",
+                description=f"```{prompt[:200]}```",
                 color=discord.Color.yellow()
             )
             start_embed.add_field(name="디렉토리", value=f"`{directory}`", inline=False)
@@ -579,69 +1012,87 @@ class ClaudeDiscordBot(commands.Bot):
 
             # 세션 생성
             session = ClaudeSession(directory, message.channel, status_msg)
-            self.session_manager.set_session(channel_id, session)
+            state.session = session
 
             try:
-                logger.info(f"세션 시작: [{directory}] {message.content[:50]}...")
-                success, output = await session.start(message.content)
+                logger.info("세션 시작: [%s] %.50s...", directory, prompt)
+                success, output = await session.start(prompt)
+                if use_cache and success:
+                    self.response_cache.put(channel_id, directory, prompt, output)
 
-                elapsed = (datetime.now() - session.start_time).total_seconds()
+                elapsed = time.monotonic() - session.start_time
                 await self._send_result(message, success, output, elapsed, status_msg)
 
             except Exception as e:
-                logger.error(f"세션 오류: {e}")
+                logger.error("세션 오류: %s", e)
                 await message.reply(f"❌ 오류: {str(e)}")
 
             finally:
                 self.session_manager.clear_session(channel_id)
 
-    async def _send_result(self, message, success, output, elapsed, status_msg):
-        """결과 전송"""
-        try:
-            await status_msg.delete()
-        except:
-            pass
+        finally:
+            self.session_manager.release(channel_id)
 
+    async def _send_result(self, message, success, output, elapsed, status_msg, cached=False):
+        """결과 전송 (상태 메시지를 결과로 수정해 삭제+전송 왕복을 줄임)"""
         color = discord.Color.green() if success else discord.Color.red()
         title = "✅ 작업 완료" if success else "❌ 작업 실패"
 
         embed = discord.Embed(title=title, color=color)
-        embed.add_field(name="⏱️ 소요 시간", value=f"{elapsed:.1f}초", inline=True)
+        if cached:
+            embed.set_footer(text="♻️ 캐시된 결과 (--fresh 로 다시 실행)")
+        else:
+            embed.add_field(name="⏱️ 소요 시간", value=f"{elapsed:.1f}초", inline=True)
 
+        # 출력을 한 번에 청크 리스트로 분할 (첫 청크는 임베드, 나머지는 후속 메시지)
         MAX_LENGTH = 1900
-        if len(output) <= MAX_LENGTH:
-            embed.description = f"```\n{output}\n```"
-            await message.reply(embed=embed)
+        chunks = [output[i:i + MAX_LENGTH] for i in range(0, len(output), MAX_LENGTH)] or [""]
+        if len(chunks) == 1:
+            embed.description = f"```\n{chunks[0]}\n```"
         else:
-            embed.description = f"```\n{output[:MAX_LENGTH]}\n```\n*(분할됨)*"
-            await message.reply(embed=embed)
+            embed.description = f"```\n{chunks[0]}\n```\n*(분할됨)*"
 
-            remaining = output[MAX_LENGTH:]
-            while remaining:
-                chunk = remaining[:MAX_LENGTH]
-                remaining = remaining[MAX_LENGTH:]
-                await message.channel.send(f"```\n{chunk}\n```")
+        # 수정 실패 시의 대체 답장이 후속 청크보다 먼저 오도록 첫 메시지를 마친 뒤 순차 전송
+        if status_msg:
+            try:
+                await status_msg.edit(embed=embed)
+            except discord.HTTPException:
+                status_msg = None
+        if not status_msg:
+            await message.reply(embed=embed)
+        for chunk in chunks[1:]:
+            await message.channel.send(f"```\n{chunk}\n```")
 
 
 # ============== 메인 함수 ==============
 
+@lru_cache(maxsize=None)
+def _load_env_file(path: str) -> dict[str, str]:
+    """.env 파일을 한 번만 읽어 KEY=VALUE 딕셔너리로 파싱 (프로세스 내 캐시)"""
+    env: dict[str, str] = {}
+    env_path = Path(path)
+    if not env_path.exists():
+        return env
+    for line in env_path.read_text(encoding='utf-8').splitlines():
+        key, sep, value = line.partition("=")
+        key = key.strip()
+        if sep and key and not key.startswith("#"):
+            env[key] = value.strip().strip('"\'')
+    return env
+
+
 async def run_bot():
     token = os.getenv("DISCORD_BOT_TOKEN")
 
     if not token:
-        env_path = Path(__file__).parent / ".env"
-        if env_path.exists():
-            with open(env_path) as f:
-                for line in f:
-                    if line.startswith("DISCORD_BOT_TOKEN="):
-                        token = line.split("=", 1)[1].strip().strip('"\'')
-                        break
+        token = _load_env_file(str(Path(__file__).parent / ".env")).get("DISCORD_BOT_TOKEN")
 
     if not token:
         print("❌ DISCORD_BOT_TOKEN을 설정하세요.")
         return
 
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
+    # 재연결 시에도 동일 커넥터 재사용, gateway DNS 결과는 5분간 캐시
+    connector = aiohttp.TCPConnector(ssl=ssl_context, ttl_dns_cache=300, limit=100)
     bot = ClaudeDiscordBot(connector=connector)
 
     try:
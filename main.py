@@ -41,7 +41,13 @@ async def run_bot() -> None:
 
     # SSL 컨텍스트 생성 (macOS 호환)
     ssl_context = create_ssl_context()
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
+    connector = aiohttp.TCPConnector(
+        ssl=ssl_context,
+        limit=config.pool_limit,
+        limit_per_host=config.per_host_limit,
+        ttl_dns_cache=config.dns_cache_ttl,
+        keepalive_timeout=config.keepalive_timeout
+    )
 
     # 봇 생성 및 실행
     bot = ClaudeDiscordBot(connector=connector)
@@ -4,6 +4,7 @@
 """
 
 import os
+import asyncio
 import logging
 from datetime import datetime
 
@@ -12,10 +13,20 @@ from discord.ext import commands
 import aiohttp
 
 from .managers import ConfigManager, ChannelManager
-from .session import ClaudeSession
+from .session import ClaudeSession, SessionPhase
 
 logger = logging.getLogger(__name__)
 
+# 임베드 색상/제목 상수 (호출마다 Color 객체를 새로 만들지 않도록 모듈 로드 시 생성)
+_COLOR_RUNNING = discord.Color.yellow()
+_COLOR_OK = discord.Color.green()
+_COLOR_ERR = discord.Color.red()
+_COLOR_INFO = discord.Color.blue()
+_COLOR_HELP = discord.Color.purple()
+
+_TITLE_OK = "✅ 작업 완료"
+_TITLE_ERR = "❌ 작업 실패"
+
 
 class ClaudeDiscordBot(commands.Bot):
     """Claude Code 연동 디스코드 봇"""
@@ -37,33 +48,74 @@ class ClaudeDiscordBot(commands.Bot):
 
         self.config_manager = ConfigManager(config_path)
         self.channel_manager = ChannelManager()
+        # 매 메시지 검사용 매핑 채널 ID 뷰 (ConfigManager의 매핑 dict를 그대로 반영)
+        self._mapped_channels = self.config_manager.mapped_channels
+        # 전체 채널에 걸친 동시 실행 세션 수 제한 (채널 내 직렬화는 채널 락이 담당)
+        self._dispatch_sem = asyncio.Semaphore(self._max_concurrent_sessions())
+
+        self._running_embed = self._build_start_embed(
+            "🔄 Claude Code 실행 중...", "⏳ 시작 중..."
+        )
+        self._resume_embed = self._build_start_embed(
+            "🔄 대화 이어가기...", "⏳ 이전 대화에서 이어가는 중..."
+        )
 
         self._register_commands()
+        self._command_names = frozenset(command.name for command in self.commands)
+
+    def _max_concurrent_sessions(self) -> int:
+        """동시 실행 한도 설정값 (0 이하면 모든 세션이 멈추므로 최소 1, 잘못된 값은 기본값)"""
+        value = self.config_manager.get_setting("max_concurrent_sessions", 8)
+        try:
+            return max(1, int(value))
+        except (TypeError, ValueError):
+            logger.warning("max_concurrent_sessions 값이 올바르지 않아 기본값 사용: %r", value)
+            return 8
+
+    @staticmethod
+    def _build_start_embed(title: str, status_text: str) -> discord.Embed:
+        """시작 메시지 템플릿 생성 (디렉토리 필드는 전송 시 채움)"""
+        embed = discord.Embed(title=title, color=_COLOR_RUNNING)
+        embed.add_field(name="디렉토리", value="-", inline=False)
+        embed.add_field(name="상태", value=status_text, inline=False)
+        return embed
+
+    async def close(self) -> None:
+        """종료 전 지연 저장 중인 설정 기록"""
+        await self.config_manager.flush()
+        await super().close()
 
     # === 이벤트 핸들러 ===
 
     async def on_ready(self) -> None:
         """봇 준비 완료"""
-        logger.info(f"봇 로그인: {self.user}")
-        logger.info(f"등록된 매핑: {len(self.config_manager.get_all_mappings())}개")
+        logger.info("봇 로그인: %s", self.user)
+        logger.info("등록된 매핑: %s개", len(self._mapped_channels))
 
     async def on_message(self, message: discord.Message) -> None:
         """메시지 수신 처리"""
         if message.author.bot:
             return
 
-        # 명령어 처리
         if message.content.startswith("!"):
-            await self.process_commands(message)
+            await self._dispatch_command(message)
             return
 
-        # 매핑된 채널만 처리
-        directory = self.config_manager.get_directory(message.channel.id)
-        if not directory:
+        # 매핑되지 않은 채널(대부분의 메시지)은 set 검사 한 번으로 종료
+        channel_id = message.channel.id
+        if channel_id not in self._mapped_channels:
             return
 
+        directory = self.config_manager.get_directory(channel_id)
+
         await self._handle_claude_message(message, directory)
 
+    async def _dispatch_command(self, message: discord.Message) -> None:
+        """등록된 명령어일 때만 컨텍스트 생성 (그 외 ! 메시지는 무시)"""
+        parts = message.content[1:].split(None, 1)
+        if parts and parts[0] in self._command_names:
+            await self.process_commands(message)
+
     async def _handle_claude_message(
         self,
         message: discord.Message,
@@ -73,14 +125,15 @@ class ClaudeDiscordBot(commands.Bot):
         channel_id = message.channel.id
         session = self.channel_manager.get_session(channel_id)
 
-        # 입력 대기 중인 세션이 있으면 메시지 전달
-        if session and session.is_running and session.is_waiting_input:
+        # 입력 대기 중인 세션이 있으면 메시지 전달 (진행 단계 속성 하나로 판별)
+        state = session.state if session else SessionPhase.IDLE
+        if state == SessionPhase.WAITING_INPUT:
             await session.send_user_input(message.content)
             await message.add_reaction("📝")
             return
 
         # 이미 실행 중이면 대기 메시지
-        if session and session.is_running:
+        if state == SessionPhase.RUNNING:
             await message.reply("⏳ **작업이 실행 중입니다.** 완료 후 다시 시도하세요.")
             return
 
@@ -97,53 +150,69 @@ class ClaudeDiscordBot(commands.Bot):
         lock = self.channel_manager.get_lock(channel_id)
 
         async with lock:
-            # 기존 Claude Code 세션 ID 조회 (대화 이어가기)
-            claude_session_id = self.config_manager.get_claude_session_id(channel_id)
+            # 전역 슬롯은 채널 락을 얻은 뒤에 잡음 (같은 채널 대기 중에는 슬롯을 차지하지 않음)
+            if self._dispatch_sem.locked():
+                await message.reply("⏳ 다른 채널의 작업이 많아 대기 중입니다. 차례가 되면 자동으로 시작합니다.")
+            async with self._dispatch_sem:
+                await self._run_session(message, directory)
 
-            status_msg = await self._send_start_message(
-                message, directory, is_resume=bool(claude_session_id)
-            )
+    async def _run_session(
+        self,
+        message: discord.Message,
+        directory: str
+    ) -> None:
+        """세션 실행 및 결과 전송 (채널 락과 전역 슬롯을 잡은 상태에서 호출)"""
+        channel_id = message.channel.id
 
-            skip_permissions = self.config_manager.get_skip_permissions(channel_id)
+        # 기존 Claude Code 세션 ID 조회 (대화 이어가기)
+        claude_session_id = self.config_manager.get_claude_session_id(channel_id)
 
-            session = ClaudeSession(
-                directory=directory,
-                channel=message.channel,
-                status_msg=status_msg,
-                timeout=self.config_manager.timeout,
-                claude_session_id=claude_session_id,
-                skip_permissions=skip_permissions
-            )
-            self.channel_manager.set_session(channel_id, session)
+        status_msg = await self._send_start_message(
+            message, directory, is_resume=bool(claude_session_id)
+        )
 
-            try:
-                logger.info(f"세션 시작: [{directory}] {message.content[:50]}...")
+        skip_permissions = self.config_manager.get_skip_permissions(channel_id)
+
+        session = ClaudeSession(
+            directory=directory,
+            channel=message.channel,
+            status_msg=status_msg,
+            timeout=self.config_manager.timeout,
+            claude_session_id=claude_session_id,
+            skip_permissions=skip_permissions
+        )
+        self.channel_manager.set_session(channel_id, session)
+
+        try:
+            # INFO 로그가 꺼져 있으면 미리보기 문자열을 만들지 않음
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("세션 시작: [%s] %.50s...", directory, message.content)
                 if claude_session_id:
-                    logger.info(f"기존 대화 이어가기: {claude_session_id}")
+                    logger.info("기존 대화 이어가기: %s", claude_session_id)
 
-                success, output = await session.start(message.content)
+            success, output = await session.start(message.content)
 
-                # 새로운 세션 ID가 있으면 저장
-                if session.new_claude_session_id:
-                    self.config_manager.set_claude_session_id(
-                        channel_id, session.new_claude_session_id
-                    )
-                    logger.info(f"세션 ID 저장: {session.new_claude_session_id}")
-
-                await self._send_result(
-                    message=message,
-                    success=success,
-                    output=output,
-                    elapsed=session.elapsed_seconds,
-                    status_msg=status_msg
+            # 새로운 세션 ID가 있으면 저장
+            if session.new_claude_session_id:
+                self.config_manager.set_claude_session_id(
+                    channel_id, session.new_claude_session_id
                 )
+                logger.info("세션 ID 저장: %s", session.new_claude_session_id)
+
+            await self._send_result(
+                message=message,
+                success=success,
+                output=output,
+                elapsed=session.elapsed_seconds,
+                status_msg=status_msg
+            )
 
-            except Exception as e:
-                logger.error(f"세션 오류: {e}")
-                await message.reply(f"❌ 오류: {str(e)}")
+        except Exception as e:
+            logger.error("세션 오류: %s", e)
+            await message.reply(f"❌ 오류: {str(e)}")
 
-            finally:
-                self.channel_manager.clear_session(channel_id)
+        finally:
+            self.channel_manager.clear_session(channel_id)
 
     async def _send_start_message(
         self,
@@ -152,20 +221,14 @@ class ClaudeDiscordBot(commands.Bot):
         is_resume: bool = False
     ) -> discord.Message:
         """시작 메시지 전송"""
-        content_preview = message.content[:200]
-        if len(message.content) > 200:
-            content_preview += "..."
+        content = message.content
+        content_preview = content[:200] + "..." if len(content) > 200 else content
 
-        title = "🔄 Claude Code 실행 중..." if not is_resume else "🔄 대화 이어가기..."
-
-        embed = discord.Embed(
-            title=title,
-            description=f"```{content_preview}```",
-            color=discord.Color.yellow()
-        )
-        embed.add_field(name="디렉토리", value=f"`{directory}`", inline=False)
-        status_text = "⏳ 시작 중..." if not is_resume else "⏳ 이전 대화에서 이어가는 중..."
-        embed.add_field(name="상태", value=status_text, inline=False)
+        # 미리 만든 템플릿을 복사해 프롬프트와 디렉토리만 채움
+        template = self._resume_embed if is_resume else self._running_embed
+        embed = template.copy()
+        embed.description = f"```{content_preview}```"
+        embed.set_field_at(0, name="디렉토리", value=f"`{directory}`", inline=False)
 
         return await message.reply(embed=embed)
 
@@ -178,13 +241,8 @@ class ClaudeDiscordBot(commands.Bot):
         status_msg: discord.Message
     ) -> None:
         """결과 메시지 전송"""
-        try:
-            await status_msg.delete()
-        except discord.HTTPException:
-            pass
-
-        color = discord.Color.green() if success else discord.Color.red()
-        title = "✅ 작업 완료" if success else "❌ 작업 실패"
+        color = _COLOR_OK if success else _COLOR_ERR
+        title = _TITLE_OK if success else _TITLE_ERR
 
         embed = discord.Embed(title=title, color=color)
         embed.add_field(name="⏱️ 소요 시간", value=f"{elapsed:.1f}초", inline=True)
@@ -194,37 +252,69 @@ class ClaudeDiscordBot(commands.Bot):
         EMBED_MAX = 4000  # embed description 최대 길이
         MESSAGE_MAX = 1900  # 일반 메시지 최대 길이 (코드블록 마크업 포함)
 
-        if len(output) <= EMBED_MAX:
-            embed.description = f"```\n{output}\n```"
-            await message.reply(embed=embed)
-        else:
-            # 분할 전송
+        async def delete_status() -> None:
+            try:
+                await status_msg.delete()
+            except discord.HTTPException:
+                pass
+
+        async def send_output() -> None:
+            if len(output) <= EMBED_MAX:
+                embed.description = f"```\n{output}\n```"
+                await message.reply(embed=embed)
+                return
+
+            # 분할 전송 (순서가 섞이지 않도록 청크끼리는 순차 전송)
             embed.description = f"```\n{output[:EMBED_MAX]}\n```\n*(분할됨)*"
             await message.reply(embed=embed)
 
-            remaining = output[EMBED_MAX:]
-            while remaining:
-                chunk = remaining[:MESSAGE_MAX]
-                remaining = remaining[MESSAGE_MAX:]
+            # 남은 부분을 매번 잘라 복사하지 않고 인덱스로 구간만 슬라이스
+            for i in range(EMBED_MAX, len(output), MESSAGE_MAX):
+                chunk = output[i:i + MESSAGE_MAX]
                 await message.channel.send(f"```\n{chunk}\n```")
 
+        # 상태 메시지 삭제와 결과 전송은 서로 독립적이므로 왕복 시간을 겹침
+        await asyncio.gather(delete_status(), send_output())
+
     # === 명령어 등록 ===
 
     def _register_commands(self) -> None:
         """봇 명령어 등록"""
 
+        # 도움말은 내용이 고정이므로 한 번만 생성해 재사용
+        help_embed = discord.Embed(
+            title="🤖 Claude Code 봇 (양방향 인터랙티브)",
+            description=(
+                "디스코드에서 Claude Code를 실행합니다.\n"
+                "**권한 요청, 추가 질문에 실시간 응답** 가능!\n"
+                "채널별로 대화가 유지됩니다."
+            ),
+            color=_COLOR_HELP
+        )
+        help_embed.add_field(name="!설정 <경로>", value="채널-디렉토리 연결", inline=False)
+        help_embed.add_field(name="!해제", value="연결 해제", inline=False)
+        help_embed.add_field(name="!중단", value="현재 실행 중단", inline=False)
+        help_embed.add_field(name="!초기화", value="대화 기록 초기화 (새 대화 시작)", inline=False)
+        help_embed.add_field(name="!권한 [on/off]", value="권한 자동 허용 설정", inline=False)
+        help_embed.add_field(name="!정보", value="채널 정보 확인", inline=False)
+        help_embed.add_field(name="!목록", value="모든 매핑 표시", inline=False)
+
         @self.command(name="설정")
         async def cmd_set_directory(ctx: commands.Context, *, directory: str):
             """채널-디렉토리 연결"""
             directory = os.path.expanduser(directory.strip())
 
-            if not os.path.isdir(directory):
+            # 느린 파일시스템에서 stat이 이벤트 루프를 막지 않도록 스레드에서 확인
+            exists = await asyncio.get_running_loop().run_in_executor(
+                None, os.path.isdir, directory
+            )
+            if not exists:
                 await ctx.send(f"❌ 디렉토리가 존재하지 않습니다: `{directory}`")
                 return
 
             self.config_manager.set_directory(ctx.channel.id, directory)
             await ctx.send(f"✅ 이 채널이 연결되었습니다:\n`{directory}`")
-            logger.info(f"채널 {ctx.channel.id} -> {directory} 매핑됨")
+            logger.info("채널 %s -> %s 매핑됨", ctx.channel.id, directory)
 
         @self.command(name="해제")
         async def cmd_remove_directory(ctx: commands.Context):
@@ -251,7 +341,7 @@ class ClaudeDiscordBot(commands.Bot):
             """대화 기록 초기화 (새 대화 시작)"""
             if self.config_manager.clear_claude_session_id(ctx.channel.id):
                 await ctx.send("🔄 대화 기록이 초기화되었습니다. 다음 메시지부터 새 대화로 시작합니다.")
-                logger.info(f"채널 {ctx.channel.id} 세션 초기화됨")
+                logger.info("채널 %s 세션 초기화됨", ctx.channel.id)
             else:
                 await ctx.send("ℹ️ 이 채널에 저장된 대화 기록이 없습니다.")
 
@@ -276,23 +366,25 @@ class ClaudeDiscordBot(commands.Bot):
                     "Claude가 파일 읽기/쓰기, 명령 실행 등을 자동으로 수행합니다.\n"
                     "신뢰할 수 있는 프로젝트에서만 사용하세요!"
                 )
-                logger.warning(f"채널 {ctx.channel.id} 권한 자동 허용 활성화")
+                logger.warning("채널 %s 권한 자동 허용 활성화", ctx.channel.id)
             elif mode in ("off", "끄기", "수동"):
                 self.config_manager.set_skip_permissions(ctx.channel.id, False)
                 await ctx.send("✅ **권한 수동 승인 모드로 변경되었습니다.**")
-                logger.info(f"채널 {ctx.channel.id} 권한 자동 허용 비활성화")
+                logger.info("채널 %s 권한 자동 허용 비활성화", ctx.channel.id)
             else:
                 await ctx.send("❌ 올바른 모드를 입력하세요: `on` 또는 `off`")
 
         @self.command(name="정보")
         async def cmd_show_info(ctx: commands.Context):
             """채널 정보 표시"""
-            directory = self.config_manager.get_directory(ctx.channel.id)
+            # 채널 설정은 레코드 하나로 한 번에 조회
+            channel_config = self.config_manager.get_channel_config(ctx.channel.id)
+            directory = channel_config.directory
+            claude_session_id = channel_config.claude_session_id
+            skip_permissions = channel_config.skip_permissions
             session = self.channel_manager.get_session(ctx.channel.id)
-            claude_session_id = self.config_manager.get_claude_session_id(ctx.channel.id)
-            skip_permissions = self.config_manager.get_skip_permissions(ctx.channel.id)
 
-            embed = discord.Embed(title="📁 채널 정보", color=discord.Color.blue())
+            embed = discord.Embed(title="📁 채널 정보", color=_COLOR_INFO)
 
             if directory:
                 embed.add_field(
@@ -341,13 +433,13 @@ class ClaudeDiscordBot(commands.Bot):
 
             embed = discord.Embed(
                 title="📋 채널-디렉토리 매핑",
-                color=discord.Color.green()
+                color=_COLOR_OK
             )
 
             for channel_id, directory in mappings.items():
-                channel = self.get_channel(int(channel_id))
+                channel = self.get_channel(channel_id)
                 channel_name = channel.name if channel else "Unknown"
-                session = self.channel_manager.get_session(int(channel_id))
+                session = self.channel_manager.get_session(channel_id)
                 status = "🔄" if session and session.is_running else "✅"
 
                 embed.add_field(
@@ -361,21 +453,4 @@ class ClaudeDiscordBot(commands.Bot):
         @self.command(name="도움")
         async def cmd_show_help(ctx: commands.Context):
             """도움말 표시"""
-            embed = discord.Embed(
-                title="🤖 Claude Code 봇 (양방향 인터랙티브)",
-                description=(
-                    "디스코드에서 Claude Code를 실행합니다.\n"
-                    "**권한 요청, 추가 질문에 실시간 응답** 가능!\n"
-                    "채널별로 대화가 유지됩니다."
-                ),
-                color=discord.Color.purple()
-            )
-            embed.add_field(name="!설정 <경로>", value="채널-디렉토리 연결", inline=False)
-            embed.add_field(name="!해제", value="연결 해제", inline=False)
-            embed.add_field(name="!중단", value="현재 실행 중단", inline=False)
-            embed.add_field(name="!초기화", value="대화 기록 초기화 (새 대화 시작)", inline=False)
-            embed.add_field(name="!권한 [on/off]", value="권한 자동 허용 설정", inline=False)
-            embed.add_field(name="!정보", value="채널 정보 확인", inline=False)
-            embed.add_field(name="!목록", value="모든 매핑 표시", inline=False)
-
-            await ctx.send(embed=embed)
+            await ctx.send(embed=help_embed)
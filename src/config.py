@@ -4,12 +4,17 @@
 """
 
 import os
+import re
+import logging
 import ssl
 import certifi
 from pathlib import Path
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class BotConfig:
@@ -17,6 +22,11 @@ class BotConfig:
     token: str
     command_prefix: str = "!"
     timeout: int = 600  # 10분
+    # HTTP 연결 풀 설정 (디스코드 API 동시 요청용)
+    pool_limit: int = 200  # 전체 동시 연결 수
+    per_host_limit: int = 32  # 호스트별 동시 연결 수
+    dns_cache_ttl: int = 300  # DNS 캐시 유지 시간 (초)
+    keepalive_timeout: float = 75  # 유휴 연결 유지 시간 (초)
 
 
 @dataclass
@@ -25,34 +35,75 @@ class SSLConfig:
     context: ssl.SSLContext
 
 
+@lru_cache(maxsize=1)
 def create_ssl_context() -> ssl.SSLContext:
-    """macOS SSL 인증서 문제 해결을 위한 SSL 컨텍스트 생성"""
+    """
+    macOS SSL 인증서 문제 해결을 위한 SSL 컨텍스트 생성
+    CA 번들 파싱은 한 번만 수행하고 이후 호출은 같은 컨텍스트를 재사용
+    """
     return ssl.create_default_context(cafile=certifi.where())
 
 
+_ENV_PATH = Path(__file__).parent.parent / ".env"
+
+
+@lru_cache(maxsize=None)
+def _env_line_re(name: str) -> re.Pattern:
+    """.env의 NAME=값 줄 (따옴표는 값에서 제외, 공백 패턴이 줄바꿈을 넘지 않도록 [ \\t]만 허용)"""
+    return re.compile(
+        rf'^[ \t]*{re.escape(name)}[ \t]*=[ \t]*["\']?([^"\'\r\n]+)["\']?[ \t\r]*$', re.M
+    )
+
+
+@lru_cache(maxsize=1)
+def _read_env_file() -> str:
+    """.env 파일 내용 (시작 시 한 번만 읽음, 없으면 빈 문자열)"""
+    if _ENV_PATH.exists():
+        return _ENV_PATH.read_text(encoding='utf-8')
+    return ""
+
+
+def _get_env(name: str) -> Optional[str]:
+    """환경 변수 또는 .env 파일에서 값 로드 (환경 변수 우선)"""
+    value = os.getenv(name)
+    if not value:
+        match = _env_line_re(name).search(_read_env_file())
+        if match:
+            value = match.group(1).strip()
+    return value or None
+
+
+def _get_env_number(name: str, default, cast=int):
+    """숫자 설정 로드 (없거나 잘못된 값이면 기본값)"""
+    value = _get_env(name)
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        logger.warning("%s 값이 올바르지 않아 기본값 사용: %r", name, value)
+        return default
+
+
 def load_token() -> Optional[str]:
     """
     디스코드 봇 토큰 로드
     환경 변수 또는 .env 파일에서 로드
     """
-    token = os.getenv("DISCORD_BOT_TOKEN")
-
-    if not token:
-        env_path = Path(__file__).parent.parent / ".env"
-        if env_path.exists():
-            with open(env_path, encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith("DISCORD_BOT_TOKEN="):
-                        token = line.split("=", 1)[1].strip().strip('"\'')
-                        break
-
-    return token
+    return _get_env("DISCORD_BOT_TOKEN")
 
 
 def load_bot_config() -> Optional[BotConfig]:
-    """봇 설정 로드"""
+    """봇 설정 로드 (연결 풀 설정은 DISCORD_POOL_LIMIT 등으로 조정 가능)"""
     token = load_token()
     if not token:
         return None
-    return BotConfig(token=token)
+    return BotConfig(
+        token=token,
+        pool_limit=_get_env_number("DISCORD_POOL_LIMIT", BotConfig.pool_limit),
+        per_host_limit=_get_env_number("DISCORD_PER_HOST_LIMIT", BotConfig.per_host_limit),
+        dns_cache_ttl=_get_env_number("DISCORD_DNS_CACHE_TTL", BotConfig.dns_cache_ttl),
+        keepalive_timeout=_get_env_number(
+            "DISCORD_KEEPALIVE_TIMEOUT", BotConfig.keepalive_timeout, float
+        ),
+    )
@@ -1,6 +1,6 @@
 """매니저 모듈"""
 
-from .config_manager import ConfigManager
+from .config_manager import ConfigManager, ChannelConfig
 from .channel_manager import ChannelManager
 
-__all__ = ["ConfigManager", "ChannelManager"]
+__all__ = ["ConfigManager", "ChannelConfig", "ChannelManager"]
@@ -4,6 +4,7 @@
 """
 
 import asyncio
+import weakref
 from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -14,14 +15,18 @@ class ChannelManager:
     """채널별 락 및 세션 관리자"""
 
     def __init__(self):
-        self._locks: dict[int, asyncio.Lock] = {}
+        # 락은 사용 중인 쪽(async with 범위의 지역 변수, 대기자)만 강한 참조를 가지므로
+        # 세션이 끝나 아무도 참조하지 않으면 자동으로 제거됨 (채널 수만큼 누적되지 않음)
+        self._locks: 'weakref.WeakValueDictionary[int, asyncio.Lock]' = weakref.WeakValueDictionary()
         self._sessions: dict[int, 'ClaudeSession'] = {}
 
     def get_lock(self, channel_id: int) -> asyncio.Lock:
-        """채널별 락 획득 (없으면 생성)"""
-        if channel_id not in self._locks:
-            self._locks[channel_id] = asyncio.Lock()
-        return self._locks[channel_id]
+        """채널별 락 획득 (없으면 생성, 호출자가 참조를 유지하는 동안만 보관)"""
+        # 세션 사이에 락이 수거되므로 없는 경우가 흔함 (예외 대신 get으로 확인)
+        lock = self._locks.get(channel_id)
+        if lock is None:
+            lock = self._locks[channel_id] = asyncio.Lock()
+        return lock
 
     # === 세션 관리 ===
 
@@ -3,12 +3,20 @@
 채널-디렉토리 매핑 및 설정을 JSON 파일로 관리합니다.
 """
 
+import asyncio
+import copy
 import json
 import os
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 from dataclasses import dataclass, field
 
+try:
+    import orjson  # 선택 의존성: 설치되어 있으면 설정 직렬화에 사용
+except ImportError:
+    orjson = None
+
 
 @dataclass
 class ChannelMapping:
@@ -17,6 +25,21 @@ class ChannelMapping:
     directory: str
 
 
+@dataclass(slots=True)
+class ChannelConfig:
+    """채널별 설정 (한 채널의 값들을 한 객체에 모아 조회 한 번으로 접근)"""
+    directory: Optional[str] = None
+    claude_session_id: Optional[str] = None
+    skip_permissions: bool = False
+
+    def is_empty(self) -> bool:
+        return self.directory is None and self.claude_session_id is None and not self.skip_permissions
+
+
+# 설정이 없는 채널 조회용 기본값 (읽기 전용, 수정 금지)
+_EMPTY_CHANNEL = ChannelConfig()
+
+
 class ConfigManager:
     """JSON 설정 파일 관리자"""
 
@@ -26,103 +49,214 @@ class ConfigManager:
         "channel_skip_permissions": {},  # 채널별 권한 자동 허용 설정
         "settings": {
             "timeout": 600,
-            "max_output_length": 4000
+            "max_output_length": 4000,
+            "max_concurrent_sessions": 8  # 전체 동시 실행 세션 수
         }
     }
 
+    SAVE_DELAY = 0.5  # 저장 디바운스 간격 (초)
+
     def __init__(self, config_path: str = "config.json"):
         self._config_path = Path(config_path)
         self._config = self._load()
+        # 최상위 키를 보장해 두고 하위 dict를 직접 참조 (조회마다 .get(..., {}) 체인 방지)
+        for key, default in self.DEFAULT_CONFIG.items():
+            self._config.setdefault(key, copy.deepcopy(default))
+        # 채널별 설정은 메모리에서 int 키 -> ChannelConfig 하나로 유지 (메시지마다 str 변환 방지)
+        # 파일에는 기존 호환을 위해 세 개의 dict로 나눠 기록 (로드/저장 시에만 변환)
+        self._channels: dict[int, ChannelConfig] = self._build_channels()
+        self._settings: dict = self._config["settings"]
+        # 채널 ID -> 디렉토리 매핑 (set_directory/remove_directory에서 함께 갱신, 등록 순서 유지)
+        self._mappings: dict[int, str] = {
+            cid: ch.directory for cid, ch in self._channels.items() if ch.directory is not None
+        }
+        # 복사 없이 돌려주는 읽기 전용 뷰와 매 메시지 검사용 채널 ID 뷰 (둘 다 _mappings를 그대로 반영)
+        self._mappings_view: Mapping[int, str] = MappingProxyType(self._mappings)
+        self.mapped_channels = self._mappings.keys()
+        # 설정값은 실행 중 바뀌지 않으므로 한 번만 읽어 둠
+        self._timeout: int = self._settings.get("timeout", 600)
+        self._max_output_length: int = self._settings.get("max_output_length", 4000)
+        self._dirty = False
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._save_task: Optional[asyncio.Task] = None
 
     def _load(self) -> dict:
         """설정 파일 로드"""
         if self._config_path.exists():
-            with open(self._config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return self.DEFAULT_CONFIG.copy()
+            data = self._config_path.read_bytes()
+            return orjson.loads(data) if orjson else json.loads(data)
+        # 중첩 dict까지 복사 (얕은 복사는 클래스 기본값을 인스턴스 간에 공유함)
+        return copy.deepcopy(self.DEFAULT_CONFIG)
 
     def _save(self) -> None:
-        """설정 파일 저장"""
-        with open(self._config_path, 'w', encoding='utf-8') as f:
-            json.dump(self._config, f, indent=2, ensure_ascii=False)
+        """
+        설정 파일 저장 예약
+        이벤트 루프 안에서는 변경 표시 후 SAVE_DELAY 뒤에 한 번만 기록 (연속 변경 병합),
+        루프 밖에서는 즉시 기록
+        """
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._dirty = False
+            self._write_atomic(self._serialize())
+            return
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(self.SAVE_DELAY, self._flush_soon)
+
+    def _flush_soon(self) -> None:
+        """디바운스 만료 시 저장 태스크 시작"""
+        self._save_handle = None
+        # 진행 중인 저장이 있으면 해당 태스크가 dirty 상태를 이어서 처리
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._write_pending())
+
+    async def _write_pending(self) -> None:
+        """dirty 상태가 풀릴 때까지 기록 (기록 중 변경분도 반영)"""
+        while self._dirty:
+            self._dirty = False
+            # 직렬화는 루프에서 (동시 수정 방지), 파일 쓰기만 스레드로
+            data = self._serialize()
+            await asyncio.get_running_loop().run_in_executor(None, self._write_atomic, data)
+
+    def _build_channels(self) -> dict[int, ChannelConfig]:
+        """파일의 채널별 dict 세 개를 채널 ID별 ChannelConfig로 병합"""
+        channels: dict[int, ChannelConfig] = {}
+        for k, v in self._config["channel_mappings"].items():
+            channels.setdefault(int(k), ChannelConfig()).directory = v
+        for k, v in self._config["channel_sessions"].items():
+            channels.setdefault(int(k), ChannelConfig()).claude_session_id = v
+        for k, v in self._config["channel_skip_permissions"].items():
+            channels.setdefault(int(k), ChannelConfig()).skip_permissions = v
+        return channels
+
+    def _channel(self, channel_id: int) -> ChannelConfig:
+        """수정용 채널 설정 조회 (없으면 생성)"""
+        ch = self._channels.get(channel_id)
+        if ch is None:
+            ch = self._channels[channel_id] = ChannelConfig()
+        return ch
+
+    def _prune(self, channel_id: int, ch: ChannelConfig) -> None:
+        """모든 값이 비어 있는 채널 설정 제거"""
+        if ch.is_empty():
+            del self._channels[channel_id]
+
+    def _serialize(self) -> bytes:
+        """현재 설정을 UTF-8 JSON으로 직렬화 (int 채널 ID 키는 문자열 키로 기록됨)"""
+        channels = self._channels.items()
+        config = {
+            **self._config,
+            "channel_mappings": {cid: ch.directory for cid, ch in channels if ch.directory is not None},
+            "channel_sessions": {
+                cid: ch.claude_session_id for cid, ch in channels if ch.claude_session_id is not None
+            },
+            "channel_skip_permissions": {cid: True for cid, ch in channels if ch.skip_permissions},
+        }
+        if orjson:
+            return orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(config, indent=2, ensure_ascii=False).encode('utf-8')
+
+    def _write_atomic(self, data: bytes) -> None:
+        """임시 파일에 쓴 뒤 교체 (기록 도중 중단되어도 기존 파일 보존)"""
+        tmp_path = self._config_path.with_name(self._config_path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self._config_path)
+
+    async def flush(self) -> None:
+        """대기 중인 변경 사항을 즉시 디스크에 기록"""
+        if self._save_handle:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._save_task and not self._save_task.done():
+            await self._save_task
+        await self._write_pending()
 
     # === 채널 매핑 관리 ===
 
+    def get_channel_config(self, channel_id: int) -> ChannelConfig:
+        """채널의 전체 설정 조회 (읽기 전용, 설정이 없으면 기본값)"""
+        return self._channels.get(channel_id, _EMPTY_CHANNEL)
+
     def get_directory(self, channel_id: int) -> Optional[str]:
         """채널 ID에 매핑된 디렉토리 조회"""
-        return self._config.get("channel_mappings", {}).get(str(channel_id))
+        return self._channels.get(channel_id, _EMPTY_CHANNEL).directory
 
     def set_directory(self, channel_id: int, directory: str) -> None:
         """채널-디렉토리 매핑 설정"""
-        if "channel_mappings" not in self._config:
-            self._config["channel_mappings"] = {}
-        self._config["channel_mappings"][str(channel_id)] = directory
+        self._channel(channel_id).directory = directory
+        self._mappings[channel_id] = directory
         self._save()
 
     def remove_directory(self, channel_id: int) -> bool:
         """채널-디렉토리 매핑 제거"""
-        key = str(channel_id)
-        if key in self._config.get("channel_mappings", {}):
-            del self._config["channel_mappings"][key]
+        if channel_id in self._mappings:
+            ch = self._channels[channel_id]
+            ch.directory = None
+            del self._mappings[channel_id]
+            self._prune(channel_id, ch)
             self._save()
             return True
         return False
 
-    def get_all_mappings(self) -> dict[str, str]:
-        """모든 채널-디렉토리 매핑 조회"""
-        return self._config.get("channel_mappings", {}).copy()
+    def get_all_mappings(self) -> Mapping[int, str]:
+        """모든 채널-디렉토리 매핑 조회 (복사 없는 읽기 전용 뷰, 등록 순서 유지)"""
+        return self._mappings_view
 
     # === Claude Code 세션 관리 ===
 
     def get_claude_session_id(self, channel_id: int) -> Optional[str]:
         """채널의 Claude Code 세션 ID 조회"""
-        return self._config.get("channel_sessions", {}).get(str(channel_id))
+        return self._channels.get(channel_id, _EMPTY_CHANNEL).claude_session_id
 
     def set_claude_session_id(self, channel_id: int, session_id: str) -> None:
         """채널의 Claude Code 세션 ID 저장"""
-        if "channel_sessions" not in self._config:
-            self._config["channel_sessions"] = {}
-        self._config["channel_sessions"][str(channel_id)] = session_id
+        self._channel(channel_id).claude_session_id = session_id
         self._save()
 
     def clear_claude_session_id(self, channel_id: int) -> bool:
         """채널의 Claude Code 세션 ID 삭제 (새 대화 시작)"""
-        key = str(channel_id)
-        if key in self._config.get("channel_sessions", {}):
-            del self._config["channel_sessions"][key]
+        ch = self._channels.get(channel_id)
+        if ch is not None and ch.claude_session_id is not None:
+            ch.claude_session_id = None
+            self._prune(channel_id, ch)
             self._save()
             return True
         return False
 
-    def get_all_sessions(self) -> dict[str, str]:
+    def get_all_sessions(self) -> dict[int, str]:
         """모든 채널-세션 ID 매핑 조회"""
-        return self._config.get("channel_sessions", {}).copy()
+        return {
+            cid: ch.claude_session_id
+            for cid, ch in self._channels.items()
+            if ch.claude_session_id is not None
+        }
 
     # === 권한 자동 허용 설정 ===
 
     def get_skip_permissions(self, channel_id: int) -> bool:
         """채널의 권한 자동 허용 설정 조회"""
-        return self._config.get("channel_skip_permissions", {}).get(str(channel_id), False)
+        return self._channels.get(channel_id, _EMPTY_CHANNEL).skip_permissions
 
     def set_skip_permissions(self, channel_id: int, skip: bool) -> None:
         """채널의 권한 자동 허용 설정"""
-        if "channel_skip_permissions" not in self._config:
-            self._config["channel_skip_permissions"] = {}
-        self._config["channel_skip_permissions"][str(channel_id)] = skip
+        ch = self._channel(channel_id)
+        ch.skip_permissions = skip
+        self._prune(channel_id, ch)
         self._save()
 
     # === 설정값 관리 ===
 
     def get_setting(self, key: str, default=None):
         """설정값 조회"""
-        return self._config.get("settings", {}).get(key, default)
+        return self._settings.get(key, default)
 
     @property
     def timeout(self) -> int:
         """타임아웃 설정"""
-        return self.get_setting("timeout", 600)
+        return self._timeout
 
     @property
     def max_output_length(self) -> int:
         """최대 출력 길이"""
-        return self.get_setting("max_output_length", 4000)
+        return self._max_output_length
@@ -7,11 +7,16 @@ import asyncio
 import json
 import os
 import pty
+import re
+import signal
+import time
+import tempfile
 import uuid
 import logging
-from datetime import datetime
+from collections import deque
 from typing import Optional, Callable, Awaitable
 from dataclasses import dataclass, field
+from enum import IntEnum
 
 import discord
 
@@ -19,16 +24,113 @@ from .ui import PermissionView, AnswerButtonView
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson  # 선택 의존성: 설치되어 있으면 스트림 JSON 파싱에 사용
+except ImportError:
+    orjson = None
 
-@dataclass
+
+# 권한 거부 오류 감지 (키워드 여러 개를 대소문자 무시 정규식 한 번으로 검사)
+_PERMISSION_ERROR_RE = re.compile(
+    r"permission|haven't granted|requires? approval|was blocked|command requires",
+    re.IGNORECASE
+)
+
+
+def _json_loads(data: bytes):
+    """JSON 역직렬화 (실패 시 ValueError 계열: JSONDecodeError, 표준 json의 UnicodeDecodeError)"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+class SessionPhase(IntEnum):
+    """세션 진행 단계 (is_running/is_waiting_input을 하나의 값으로 요약)"""
+    IDLE = 0
+    RUNNING = 1
+    WAITING_INPUT = 2
+
+
+class ContentBuffer:
+    """
+    스트리밍 텍스트 누적 버퍼
+    일정 크기를 넘으면 임시 파일로 넘기고, 메모리에는 미리보기용 꼬리만 유지
+    """
+
+    SPOOL_SIZE = 1024 * 1024  # 이 크기(바이트)를 넘으면 디스크로 이동
+    TAIL_SIZE = 2000  # 메모리에 유지할 마지막 문자 수
+
+    def __init__(self):
+        self._file = tempfile.SpooledTemporaryFile(
+            max_size=self.SPOOL_SIZE, mode='w+', encoding='utf-8'
+        )
+        self._length = 0
+        # 미리보기용 꼬리는 조각 단위로 보관 (델타마다 문자열을 이어 붙이지 않음)
+        self._tail_parts: deque[str] = deque()
+        self._tail_length = 0
+        self.version = 0  # 내용이 바뀔 때마다 증가 (미리보기 재생성 여부 판단용)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, text: str) -> None:
+        if not text:
+            return
+        self._file.write(text)
+        self._length += len(text)
+        self.version += 1
+        self._tail_parts.append(text)
+        self._tail_length += len(text)
+        # 맨 앞 조각을 빼도 TAIL_SIZE 이상 남으면 제거
+        while self._tail_length - len(self._tail_parts[0]) >= self.TAIL_SIZE:
+            self._tail_length -= len(self._tail_parts.popleft())
+
+    @property
+    def tail(self) -> str:
+        """마지막 TAIL_SIZE자 (상태 갱신 시에만 합침)"""
+        return "".join(self._tail_parts)[-self.TAIL_SIZE:]
+
+    def last(self, n: int) -> str:
+        """마지막 n자 (n을 채우는 뒤쪽 조각만 합침)"""
+        if n >= self._tail_length:
+            return self.tail
+        parts = []
+        size = 0
+        for part in reversed(self._tail_parts):
+            parts.append(part)
+            size += len(part)
+            if size >= n:
+                break
+        parts.reverse()
+        return "".join(parts)[-n:]
+
+    def replace(self, text: str) -> None:
+        self._file.seek(0)
+        self._file.truncate()
+        self._length = 0
+        self._tail_parts.clear()
+        self._tail_length = 0
+        self.version += 1
+        self.append(text)
+
+    def read_all(self) -> str:
+        """전체 내용 읽기 (세션 종료 시 최종 출력용)"""
+        self._file.seek(0)
+        return self._file.read()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+@dataclass(slots=True)
 class SessionState:
     """세션 상태"""
     is_running: bool = False
     is_waiting_input: bool = False
     is_waiting_permission: bool = False  # 권한 대기 상태
-    current_content: str = ""
+    content: ContentBuffer = field(default_factory=ContentBuffer)  # 스트리밍 텍스트
     current_tool: Optional[str] = None
-    permission_denied: list = field(default_factory=list)
+    # 최근 권한 거부 오류 (최대 16개) 및 그 오류들의 해시 (중복 처리 방지, 같은 개수로 유지)
+    permission_denied: deque = field(default_factory=lambda: deque(maxlen=16))
+    seen_denials: set = field(default_factory=set)
     needs_permission_restart: bool = False  # 권한 허용 후 재시작 필요
 
 
@@ -36,6 +138,22 @@ class ClaudeSession:
     """Claude Code 프로세스 세션 (양방향 인터랙티브)"""
 
     UPDATE_INTERVAL = 1.5  # 상태 업데이트 간격 (rate limit 방지)
+    READ_CHUNK_SIZE = 65536  # stdout/stderr 한 번에 읽을 최대 바이트 수
+    STREAM_BUFFER_LIMIT = 1024 * 1024  # 서브프로세스 StreamReader 버퍼 한도
+    STDERR_MAX_BYTES = 64 * 1024  # 오류 메시지용으로 보관할 stderr 최대 크기
+    PIPE_WAIT = 3  # 프로세스 종료 후 파이프가 닫히기를 기다릴 최대 시간 (초)
+
+    # 델타마다 읽고 쓰는 속성이 많아 인스턴스 __dict__ 대신 슬롯 사용
+    __slots__ = (
+        "session_id", "directory", "channel", "status_msg", "timeout",
+        "skip_permissions", "claude_session_id", "_new_claude_session_id",
+        "_process", "_stderr_task", "_idle_handle", "_idle_future", "_last_activity", "_timed_out",
+        "_state", "state", "_full_output", "_start_mono",
+        "_status_dirty", "_status_extra", "_status_task", "_status_embed", "_last_status_key",
+        "_master_fd", "_master_transport",
+        "_input_future",
+        "_handlers", "_system_handlers",
+    )
 
     def __init__(
         self,
@@ -57,18 +175,49 @@ class ClaudeSession:
         self._new_claude_session_id: Optional[str] = None
 
         self._process: Optional[asyncio.subprocess.Process] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._idle_handle: Optional[asyncio.TimerHandle] = None  # 유휴 타임아웃 타이머
+        self._idle_future: Optional[asyncio.Future] = None  # 타임아웃 시 완료되어 읽기 대기를 끊음
+        self._last_activity = 0.0  # 마지막 stdout 읽기 시작 시각 (loop.time 기준)
+        self._timed_out = False
         self._state = SessionState()
+        # 메시지마다 확인하는 진행 단계 (상태 변경 시 함께 갱신되는 일반 속성)
+        self.state = SessionPhase.IDLE
         self._full_output: list[str] = []
-        self._start_time = datetime.now()
-        self._last_update = datetime.now()
+        self._start_mono = time.monotonic()  # 경과 시간 측정용 (벽시계 변경 영향 없음)
+        # 상태 메시지 갱신 (핸들러는 표시만 하고 편집은 전용 태스크가 수행)
+        self._status_dirty = asyncio.Event()
+        self._status_extra: Optional[str] = None
+        self._status_task: Optional[asyncio.Task] = None
+        # 상태 임베드는 필드 배치를 미리 구성해 두고 갱신 시 값만 교체
+        self._status_embed = discord.Embed(
+            title="🔄 Claude Code 실행 중...",
+            color=discord.Color.yellow()
+        )
+        self._status_embed.add_field(name="상태", value="-", inline=True)
+        self._status_embed.add_field(name="경과", value="-", inline=True)
+        self._last_status_key: Optional[tuple[str, int]] = None
 
         # PTY 관련
         self._master_fd: Optional[int] = None
-        self._master_writer = None
+        self._master_transport: Optional[asyncio.WriteTransport] = None
 
-        # 입력 대기용 Future
+        # 입력 대기용 Future (대기 중일 때만 존재)
         self._input_future: Optional[asyncio.Future] = None
-        self._input_event = asyncio.Event()
+
+        # 메시지 타입별 핸들러 (메시지마다 바운드 메서드를 새로 만들지 않도록 한 번만 구성)
+        self._handlers = {
+            "assistant": self._handle_assistant,
+            "content_block_delta": self._handle_delta,
+            "content_block_start": self._handle_block_start,
+            "content_block_stop": self._handle_block_stop,
+            "result": self._handle_result,
+            "user": self._handle_user_message,
+        }
+        self._system_handlers = {
+            "permission_request": self._show_permission_ui,
+            "input_request": self._show_input_ui,
+        }
 
     # === 상태 프로퍼티 ===
 
@@ -80,9 +229,25 @@ class ClaudeSession:
     def is_waiting_input(self) -> bool:
         return self._state.is_waiting_input
 
+    def _set_running(self, value: bool) -> None:
+        self._state.is_running = value
+        self._sync_phase()
+
+    def _set_waiting_input(self, value: bool) -> None:
+        self._state.is_waiting_input = value
+        self._sync_phase()
+
+    def _sync_phase(self) -> None:
+        if not self._state.is_running:
+            self.state = SessionPhase.IDLE
+        elif self._state.is_waiting_input:
+            self.state = SessionPhase.WAITING_INPUT
+        else:
+            self.state = SessionPhase.RUNNING
+
     @property
     def elapsed_seconds(self) -> float:
-        return (datetime.now() - self._start_time).total_seconds()
+        return time.monotonic() - self._start_mono
 
     @property
     def new_claude_session_id(self) -> Optional[str]:
@@ -91,7 +256,7 @@ class ClaudeSession:
     # === 세션 실행 ===
 
     async def start(self, prompt: str) -> tuple[bool, str]:
-        """세션 시작 및 프롬프트 실행 (PTY + -p 모드, 권한 재시작 지원)"""
+        """세션 시작 및 프롬프트 실행 (-p 모드, 권한 확인이 필요할 때만 PTY 사용, 권한 재시작 지원)"""
         if not os.path.isdir(self.directory):
             return False, f"❌ 디렉토리가 존재하지 않습니다: {self.directory}"
 
@@ -102,6 +267,7 @@ class ClaudeSession:
             try:
                 # 상태 초기화
                 self._state = SessionState()
+                self._sync_phase()
                 self._full_output = []
 
                 # 명령어 구성 (-p 모드로 프롬프트 전달)
@@ -115,38 +281,53 @@ class ClaudeSession:
                 session_id_to_use = self._new_claude_session_id or self.claude_session_id
                 if session_id_to_use:
                     cmd.extend(["--resume", session_id_to_use])
-                    logger.info(f"[{self.session_id}] 세션 이어가기: {session_id_to_use}")
+                    logger.info("[%s] 세션 이어가기: %s", self.session_id, session_id_to_use)
 
                 if current_skip_permissions:
                     cmd.append("--dangerously-skip-permissions")
-                    logger.info(f"[{self.session_id}] 권한 자동 허용 모드")
+                    logger.info("[%s] 권한 자동 허용 모드", self.session_id)
 
-                # PTY (pseudo-terminal) 생성
-                master_fd, slave_fd = pty.openpty()
+                # 권한 자동 허용 모드에서는 권한 응답을 보낼 일이 없으므로 PTY를 만들지 않음
+                use_pty = not current_skip_permissions
+                if use_pty:
+                    # PTY (pseudo-terminal) 생성
+                    master_fd, slave_fd = pty.openpty()
 
                 self._process = await asyncio.create_subprocess_exec(
                     *cmd,
                     cwd=self.directory,
-                    stdin=slave_fd,
+                    stdin=slave_fd if use_pty else asyncio.subprocess.DEVNULL,
                     stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
+                    stderr=asyncio.subprocess.PIPE,
+                    limit=self.STREAM_BUFFER_LIMIT,
+                    # 별도 세션(프로세스 그룹)으로 실행해 종료 시 하위 프로세스까지 한 번에 정리
+                    start_new_session=True
                 )
+                # stderr를 stdout과 동시에 비워 파이프가 가득 차 프로세스가 멈추는 것을 방지
+                self._stderr_task = asyncio.create_task(self._drain_stderr())
+
+                if use_pty:
+                    os.close(slave_fd)
+                    self._master_fd = master_fd
+                    # PTY master를 논블로킹 파이프 트랜스포트로 등록 (쓰기마다 스레드 전환 없음)
+                    os.set_blocking(master_fd, False)
+                    self._master_transport, _ = await asyncio.get_running_loop().connect_write_pipe(
+                        asyncio.Protocol, os.fdopen(master_fd, 'wb', buffering=0)
+                    )
 
-                os.close(slave_fd)
-                self._master_fd = master_fd
-                self._master_writer = os.fdopen(master_fd, 'wb', buffering=0)
-
-                logger.info(f"[{self.session_id}] 프로세스 시작 (시도 {attempt + 1}, PID: {self._process.pid})")
+                logger.info("[%s] 프로세스 시작 (시도 %s, PID: %s)", self.session_id, attempt + 1, self._process.pid)
 
-                self._state.is_running = True
-                self._start_time = datetime.now()
+                self._set_running(True)
+                self._start_mono = time.monotonic()
+                self._status_task = asyncio.create_task(self._status_updater())
 
                 # 스트림 읽기
                 result = await self._read_stream()
+                await self._stop_status_updater()
 
                 # 권한 허용 후 재시작이 필요한 경우
                 if self._state.needs_permission_restart and attempt < max_retries - 1:
-                    logger.info(f"[{self.session_id}] 권한 허용됨, 재시작...")
+                    logger.info("[%s] 권한 허용됨, 재시작...", self.session_id)
                     current_skip_permissions = True  # 다음 시도는 권한 자동 허용
                     self._cleanup_pty()
 
@@ -168,53 +349,62 @@ class ClaudeSession:
             except FileNotFoundError:
                 return False, "❌ Claude Code CLI가 설치되지 않았습니다."
             except Exception as e:
-                logger.error(f"세션 오류: {e}", exc_info=True)
+                logger.error("세션 오류: %s", e, exc_info=True)
                 return False, f"❌ 실행 오류: {str(e)}"
             finally:
-                self._state.is_running = False
+                self._set_running(False)
+                await self._stop_status_updater()
                 self._cleanup_pty()
+                self._state.content.close()
 
         return False, "❌ 최대 재시도 횟수 초과"
 
     async def abort(self) -> None:
         """세션 중단"""
         if self._process:
-            self._process.kill()
-            await self._process.wait()
-        self._state.is_running = False
+            self._kill_process()
+            await self._wait_exit()
+        self._set_running(False)
         self._cleanup_pty()
         if self._input_future and not self._input_future.done():
             self._input_future.cancel()
 
+    def _kill_process(self) -> None:
+        """Claude Code 프로세스 그룹 전체 강제 종료 (도구가 띄운 하위 프로세스 포함)"""
+        # claude가 먼저 끝났어도 그룹에 남은 하위 프로세스가 파이프를 쥐고 있을 수 있으므로 항상 전송
+        try:
+            os.killpg(self._process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
     async def _end_session(self) -> None:
         """세션 정상 종료 (PTY 모드)"""
         try:
             # /exit 명령으로 Claude Code 종료
             await self._send_to_pty("/exit")
-            logger.info(f"[{self.session_id}] 세션 종료 명령 전송")
+            logger.info("[%s] 세션 종료 명령 전송", self.session_id)
         except Exception as e:
-            logger.warning(f"[{self.session_id}] 세션 종료 중 오류: {e}")
+            logger.warning("[%s] 세션 종료 중 오류: %s", self.session_id, e)
 
     def _cleanup_pty(self) -> None:
         """PTY 리소스 정리"""
-        if self._master_writer:
+        if self._master_transport:
             try:
-                self._master_writer.close()
+                self._master_transport.close()
             except Exception:
                 pass
-            self._master_writer = None
+            self._master_transport = None
         self._master_fd = None
 
     # === PTY 전송 ===
 
     async def _send_to_pty(self, text: str) -> None:
-        """PTY로 텍스트 전송"""
-        if self._master_writer:
-            data = (text + "\n").encode('utf-8')
-            # 비동기로 쓰기 (블로킹 방지)
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._master_writer.write, data)
-            logger.debug(f"[{self.session_id}] PTY 전송: {text[:50]}...")
+        """PTY로 텍스트 전송 (PTY 없이 실행한 경우 무시)"""
+        if self._master_transport:
+            # 버퍼가 비어 있으면 트랜스포트가 호출 즉시 os.write 한 번으로 보내고,
+            # EAGAIN일 때만 내부 버퍼에 쌓아 쓰기 가능 이벤트로 이어 씀 (실행기 불필요)
+            self._master_transport.write((text + "\n").encode('utf-8'))
+            logger.debug("[%s] PTY 전송: %.50s...", self.session_id, text)
 
     async def send_permission_response(self, allowed: bool, allow_all: bool = False) -> None:
         """권한 응답 전송 (텍스트 형식)"""
@@ -227,99 +417,181 @@ class ClaudeSession:
             response = "n"
 
         await self._send_to_pty(response)
-        self._state.is_waiting_input = False
+        self._set_waiting_input(False)
 
         if self._input_future and not self._input_future.done():
             self._input_future.set_result(allowed)
 
-        logger.info(f"[{self.session_id}] 권한 응답: {response}")
+        logger.info("[%s] 권한 응답: %s", self.session_id, response)
 
     async def send_user_input(self, text: str) -> None:
         """사용자 입력 전송 (텍스트 형식)"""
+        delivered = self._master_transport is not None
         await self._send_to_pty(text)
-        self._state.is_waiting_input = False
+        self._set_waiting_input(False)
 
         if self._input_future and not self._input_future.done():
             self._input_future.set_result(text)
 
-        await self._update_status("📝 답변 전송됨")
-        logger.info(f"[{self.session_id}] 사용자 입력: {text[:50]}...")
+        self._mark_status("📝 답변 전송됨" if delivered else "⚠️ 답변을 전달할 수 없음")
+        logger.info("[%s] 사용자 입력: %.50s...", self.session_id, text)
 
     # === 스트림 처리 ===
 
     async def _read_stream(self) -> str:
         """stdout 스트림 읽기"""
+        read: Optional[asyncio.Future] = None
         try:
             line_count = 0
+            # 줄마다 readline 하지 않고 큰 청크로 읽어 버퍼에서 줄 분리
+            # (StreamReader의 줄 길이 제한도 받지 않음)
+            buf = bytearray()
+            # 읽기마다 wait_for로 감싸지 않고, 타이머 하나가 읽기 대기 시간을 감시
+            loop = asyncio.get_running_loop()
+            self._timed_out = False
+            self._idle_future = loop.create_future()
+            self._last_activity = loop.time()
+            self._idle_handle = loop.call_later(self.timeout, self._check_idle)
             while True:
-                try:
-                    line = await asyncio.wait_for(
-                        self._process.stdout.readline(),
-                        timeout=self.timeout
-                    )
-                except asyncio.TimeoutError:
-                    # 입력 대기 중일 때는 타임아웃 무시
-                    if self._state.is_waiting_input:
-                        continue
-                    raise
-
-                if not line:
-                    logger.info(f"[{self.session_id}] 스트림 종료 (총 {line_count}줄)")
+                self._last_activity = loop.time()
+                read = asyncio.ensure_future(self._process.stdout.read(self.READ_CHUNK_SIZE))
+                # 종료 신호를 보내도 파이프를 쥔 프로세스가 남으면 EOF가 오지 않으므로 타임아웃과 경합
+                await asyncio.wait((read, self._idle_future), return_when=asyncio.FIRST_COMPLETED)
+                if not read.done():
+                    read.cancel()
+                    logger.info("[%s] 타임아웃으로 스트림 읽기 중단 (총 %s줄)", self.session_id, line_count)
                     break
+                chunk = read.result()
 
-                line_count += 1
-                await self._process_line(line)
+                if not chunk:
+                    if buf:
+                        line_count += 1
+                        await self._process_line(bytes(buf))
+                    logger.info("[%s] 스트림 종료 (총 %s줄)", self.session_id, line_count)
+                    break
 
-            await self._process.wait()
+                buf += chunk
+                start = 0
+                while (nl := buf.find(b"\n", start)) >= 0:
+                    line_count += 1
+                    await self._process_line(bytes(buf[start:nl]))
+                    start = nl + 1
+                del buf[:start]
+
+            if self._timed_out:
+                return "⏰ 작업 시간 초과"
+            await self._wait_exit()
             return_code = self._process.returncode
-            logger.info(f"[{self.session_id}] 프로세스 종료 (코드: {return_code})")
+            logger.info("[%s] 프로세스 종료 (코드: %s)", self.session_id, return_code)
 
             if return_code != 0:
-                stderr = await self._process.stderr.read()
+                stderr = await self._collect_stderr()
                 if stderr:
                     error_msg = stderr.decode('utf-8', errors='replace')
-                    logger.error(f"[{self.session_id}] stderr: {error_msg}")
+                    logger.error("[%s] stderr: %s", self.session_id, error_msg)
                     return f"❌ 오류:\n{error_msg}"
 
             return self._build_final_output()
 
+        finally:
+            if self._idle_handle:
+                self._idle_handle.cancel()
+                self._idle_handle = None
+            self._idle_future = None
+            if read and not read.done():
+                read.cancel()
+            # 프로세스가 끝났으면 남은 stderr까지 받고, 아니면(예외 등) 읽기 중단
+            if self._stderr_task and self._process.returncode is None:
+                self._stderr_task.cancel()
+            elif self._stderr_task:
+                await self._collect_stderr()
+
+    def _check_idle(self) -> None:
+        """유휴 타이머 만료 처리 (그 사이 출력이 있었거나 입력 대기 중이면 다시 예약)"""
+        loop = asyncio.get_running_loop()
+        remaining = self._last_activity + self.timeout - loop.time()
+        if self._state.is_waiting_input:
+            # 입력 대기 중일 때는 타임아웃 무시
+            remaining = self.timeout
+        if remaining > 0:
+            self._idle_handle = loop.call_later(remaining, self._check_idle)
+            return
+        self._idle_handle = None
+        self._timed_out = True
+        logger.warning("[%s] %s초 동안 출력 없음 - 종료", self.session_id, self.timeout)
+        self._kill_process()
+        if self._idle_future and not self._idle_future.done():
+            self._idle_future.set_result(None)
+
+    async def _drain_stderr(self) -> bytes:
+        """stderr를 청크 단위로 읽어 마지막 STDERR_MAX_BYTES만 보관"""
+        buf = bytearray()
+        while True:
+            chunk = await self._process.stderr.read(self.READ_CHUNK_SIZE)
+            if not chunk:
+                return bytes(buf)
+            buf += chunk
+            if len(buf) > self.STDERR_MAX_BYTES:
+                del buf[:-self.STDERR_MAX_BYTES]
+
+    async def _wait_exit(self) -> Optional[int]:
+        """프로세스 종료 대기 (Process.wait는 파이프가 닫힐 때까지 기다리므로 종료 코드가 나오면 바로 반환)"""
+        while True:
+            try:
+                return await asyncio.wait_for(self._process.wait(), self.PIPE_WAIT)
+            except asyncio.TimeoutError:
+                if self._process.returncode is not None:
+                    return self._process.returncode
+
+    async def _collect_stderr(self) -> bytes:
+        """stderr 읽기 결과 (도구가 띄운 백그라운드 프로세스가 파이프를 쥐고 있을 수 있어 PIPE_WAIT초까지만 대기)"""
+        task = self._stderr_task
+        if task is None or task.cancelled():
+            return b""
+        try:
+            return await asyncio.wait_for(task, self.PIPE_WAIT)
         except asyncio.TimeoutError:
-            self._process.kill()
-            await self._process.wait()
-            return "⏰ 작업 시간 초과"
+            # wait_for가 시간 초과 시 태스크를 취소함
+            logger.warning("[%s] stderr 대기 시간 초과", self.session_id)
+            return b""
 
     def _build_final_output(self) -> str:
         """최종 출력 조합"""
         if self._full_output:
             result = "\n".join(self._full_output)
-            logger.info(f"[{self.session_id}] 최종 출력: {len(result)}자")
+            logger.info("[%s] 최종 출력: %s자", self.session_id, len(result))
             return result
 
-        if self._state.current_content:
-            return self._state.current_content
+        if len(self._state.content):
+            return self._state.content.read_all()
 
         return "출력이 없습니다."
 
     async def _process_line(self, line: bytes) -> None:
         """한 줄 처리"""
-        line_text = line.decode('utf-8', errors='replace').strip()
-        if not line_text:
+        # JSON 파서는 앞뒤 공백을 허용하므로 strip 복사 없이 그대로 파싱
+        if not line or line.isspace():
             return
 
-        logger.debug(f"[{self.session_id}] 수신: {line_text[:200]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[%s] 수신: %s", self.session_id, line[:200].decode('utf-8', errors='replace').strip())
 
         try:
-            data = json.loads(line_text)
-            await self._handle_message(data)
-        except json.JSONDecodeError:
-            self._state.current_content += line_text + "\n"
-            await self._update_status()
+            # bytes를 디코딩 없이 바로 파싱 (orjson 사용 가능 시)
+            data = _json_loads(line)
+        except ValueError:
+            # JSON이 아닌 줄만 디코딩 (JSONDecodeError와 UTF-8이 아닌 줄의 UnicodeDecodeError 모두 포함)
+            self._state.content.append(line.decode('utf-8', errors='replace').strip() + "\n")
+            self._mark_status()
+            return
+        await self._handle_message(data)
 
     async def _handle_message(self, data: dict) -> None:
         """메시지 타입별 처리"""
         msg_type = data.get("type", "")
-        subtype = data.get("subtype", "")
-        logger.info(f"[{self.session_id}] 메시지: type={msg_type}, subtype={subtype}")
+        # 델타마다 호출되는 경로이므로 레벨이 꺼져 있으면 인자 조회도 생략
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[%s] 메시지: type=%s, subtype=%s", self.session_id, msg_type, data.get("subtype", ""))
 
         self._extract_session_id(data)
 
@@ -328,27 +600,18 @@ class ClaudeSession:
             await self._handle_system_message(data)
             return
 
-        handlers = {
-            "assistant": self._handle_assistant,
-            "content_block_delta": self._handle_delta,
-            "content_block_start": self._handle_block_start,
-            "content_block_stop": self._handle_block_stop,
-            "result": self._handle_result,
-            "user": self._handle_user_message,
-        }
-
-        handler = handlers.get(msg_type)
+        handler = self._handlers.get(msg_type)
         if handler:
             await handler(data)
         else:
-            logger.debug(f"[{self.session_id}] 미처리 메시지: {data}")
+            logger.debug("[%s] 미처리 메시지: %s", self.session_id, data)
 
     def _extract_session_id(self, data: dict) -> None:
         """세션 ID 추출"""
         session_id = data.get("session_id") or data.get("sessionId")
         if session_id and not self._new_claude_session_id:
             self._new_claude_session_id = session_id
-            logger.info(f"[{self.session_id}] Claude 세션 ID: {session_id}")
+            logger.info("[%s] Claude 세션 ID: %s", self.session_id, session_id)
 
     # === 메시지 핸들러 ===
 
@@ -357,11 +620,12 @@ class ClaudeSession:
         subtype = data.get("subtype", "")
 
         if subtype == "init":
-            logger.info(f"[{self.session_id}] Claude Code 초기화 완료")
-        elif subtype == "permission_request":
-            await self._show_permission_ui(data)
-        elif subtype == "input_request":
-            await self._show_input_ui(data)
+            logger.info("[%s] Claude Code 초기화 완료", self.session_id)
+            return
+
+        handler = self._system_handlers.get(subtype)
+        if handler:
+            await handler(data)
 
     async def _show_permission_ui(self, data: dict) -> None:
         """권한 요청 UI 표시"""
@@ -369,7 +633,7 @@ class ClaudeSession:
         description = data.get("description", data.get("permission", {}).get("description", ""))
         path = data.get("path", data.get("permission", {}).get("path", ""))
 
-        self._state.is_waiting_input = True
+        self._set_waiting_input(True)
 
         embed = discord.Embed(
             title="🔐 권한 요청",
@@ -389,20 +653,18 @@ class ClaudeSession:
         )
 
         await self.channel.send(embed=embed, view=view)
-        logger.info(f"[{self.session_id}] 권한 UI 표시: {tool_name}")
+        logger.info("[%s] 권한 UI 표시: %s", self.session_id, tool_name)
 
         # 응답 대기
-        self._input_future = asyncio.Future()
         try:
-            await asyncio.wait_for(self._input_future, timeout=300)
+            await self._wait_for_input()
         except asyncio.TimeoutError:
             await self.send_permission_response(False)
-            logger.warning(f"[{self.session_id}] 권한 응답 타임아웃")
+            logger.warning("[%s] 권한 응답 타임아웃", self.session_id)
 
     async def _show_input_ui(self, data: dict) -> None:
         """사용자 입력 UI 표시"""
         question = data.get("question", data.get("message", "추가 정보가 필요합니다"))
-        self._state.is_waiting_input = True
 
         embed = discord.Embed(
             title="❓ Claude Code 질문",
@@ -410,41 +672,58 @@ class ClaudeSession:
             color=discord.Color.blue()
         )
 
+        if not self._master_transport:
+            # PTY 없이 실행 중이면 답변을 전달할 경로가 없으므로 질문만 알리고 대기하지 않음
+            embed.set_footer(text="⚠️ 권한 자동 허용 모드에서는 답변을 전달할 수 없습니다.")
+            await self.channel.send(embed=embed)
+            logger.info("[%s] 입력 요청 (전달 불가): %.50s...", self.session_id, question)
+            return
+
+        self._set_waiting_input(True)
+
         view = AnswerButtonView(
             question=question,
             on_answer=self.send_user_input
         )
 
         await self.channel.send(embed=embed, view=view)
-        logger.info(f"[{self.session_id}] 입력 UI 표시: {question[:50]}...")
+        logger.info("[%s] 입력 UI 표시: %.50s...", self.session_id, question)
 
-        self._input_future = asyncio.Future()
         try:
-            await asyncio.wait_for(self._input_future, timeout=300)
+            await self._wait_for_input()
         except asyncio.TimeoutError:
             await self.send_user_input("취소됨")
 
+    async def _wait_for_input(self, timeout: float = 300):
+        """사용자 응답 대기 (끝나면 Future를 정리해 이후 응답 콜백은 무시됨)"""
+        future = self._input_future = asyncio.get_running_loop().create_future()
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            if self._input_future is future:
+                self._input_future = None
+
     async def _handle_assistant(self, data: dict) -> None:
         """어시스턴트 메시지"""
         content = data.get("message", {}).get("content", [])
         for block in content:
             if block.get("type") == "text":
-                self._state.current_content = block.get("text", "")
-                await self._update_status()
+                self._state.content.replace(block.get("text", ""))
+                self._mark_status()
 
     async def _handle_delta(self, data: dict) -> None:
         """스트리밍 델타"""
         delta = data.get("delta", {})
         if delta.get("type") == "text_delta":
-            self._state.current_content += delta.get("text", "")
-            await self._update_status()
+            self._state.content.append(delta.get("text", ""))
+            self._mark_status()
 
     async def _handle_block_start(self, data: dict) -> None:
         """컨텐츠 블록 시작"""
         block = data.get("content_block", {})
         if block.get("type") == "tool_use":
             self._state.current_tool = block.get("name", "도구 실행")
-            await self._update_status()
+            self._mark_status()
 
     async def _handle_block_stop(self, data: dict) -> None:
         """컨텐츠 블록 종료"""
@@ -453,7 +732,7 @@ class ClaudeSession:
     async def _handle_result(self, data: dict) -> None:
         """최종 결과"""
         result_text = data.get("result", "") or data.get("text", "")
-        logger.info(f"[{self.session_id}] 결과 수신: {len(result_text)}자")
+        logger.info("[%s] 결과 수신: %s자", self.session_id, len(result_text))
         if result_text:
             self._full_output.append(result_text)
         # -p 모드에서는 결과 후 자동 종료됨
@@ -466,12 +745,18 @@ class ClaudeSession:
         for item in content:
             if item.get("type") == "tool_result" and item.get("is_error"):
                 error_content = item.get("content", "")
-                if any(keyword in error_content.lower() for keyword in [
-                    "permission", "haven't granted", "requires approval",
-                    "require approval", "was blocked", "command requires"
-                ]):
-                    self._state.permission_denied.append(error_content)
-                    logger.warning(f"[{self.session_id}] 권한 거부 감지: {error_content[:100]}")
+                # 같은 오류가 반복되면 키워드 검사와 보관을 건너뜀
+                denial_hash = hash(error_content)
+                if denial_hash in self._state.seen_denials:
+                    continue
+                if _PERMISSION_ERROR_RE.search(error_content):
+                    denied = self._state.permission_denied
+                    if len(denied) == denied.maxlen:
+                        # 밀려나는 오류의 해시도 함께 제거해 두 컬렉션 크기를 맞춤
+                        self._state.seen_denials.discard(hash(denied[0]))
+                    self._state.seen_denials.add(denial_hash)
+                    denied.append(error_content)
+                    logger.warning("[%s] 권한 거부 감지: %.100s", self.session_id, error_content)
 
                     # 첫 번째 권한 오류에서만 처리 (중복 방지)
                     if not self._state.is_waiting_permission:
@@ -483,8 +768,8 @@ class ClaudeSession:
 
         # 현재 프로세스 중단
         if self._process:
-            self._process.kill()
-            logger.info(f"[{self.session_id}] 권한 대기를 위해 프로세스 중단")
+            self._kill_process()
+            logger.info("[%s] 권한 대기를 위해 프로세스 중단", self.session_id)
 
         # 권한 요청 UI 표시
         embed = discord.Embed(
@@ -506,62 +791,79 @@ class ClaudeSession:
         )
 
         await self.channel.send(embed=embed, view=view)
-        logger.info(f"[{self.session_id}] 권한 UI 표시, 사용자 응답 대기")
+        logger.info("[%s] 권한 UI 표시, 사용자 응답 대기", self.session_id)
 
         # 응답 대기
-        self._input_future = asyncio.Future()
         try:
-            result = await asyncio.wait_for(self._input_future, timeout=300)
+            result = await self._wait_for_input()
             if result:
                 self._state.needs_permission_restart = True
-                logger.info(f"[{self.session_id}] 권한 허용됨, 재시작 플래그 설정")
+                logger.info("[%s] 권한 허용됨, 재시작 플래그 설정", self.session_id)
         except asyncio.TimeoutError:
-            logger.warning(f"[{self.session_id}] 권한 응답 타임아웃")
+            logger.warning("[%s] 권한 응답 타임아웃", self.session_id)
 
     async def _on_permission_response(self, allowed: bool, allow_all: bool = False) -> None:
-        """권한 응답 콜백"""
+        """권한 응답 콜백 (결과 표시는 PermissionView가 요청 메시지를 편집해 처리)"""
         if self._input_future and not self._input_future.done():
             self._input_future.set_result(allowed)
 
-        if allowed:
-            await self.channel.send("✅ 권한이 허용되었습니다. 작업을 이어갑니다...")
-        else:
-            await self.channel.send("❌ 권한이 거부되었습니다. 작업을 종료합니다.")
-
     # === 상태 업데이트 ===
 
-    async def _update_status(self, extra_status: str = None) -> None:
-        """디스코드 상태 업데이트"""
-        now = datetime.now()
-        if (now - self._last_update).total_seconds() < self.UPDATE_INTERVAL:
-            return
-
-        self._last_update = now
-
-        try:
+    def _mark_status(self, extra_status: str = None) -> None:
+        """상태 변경 표시 (실제 편집은 갱신 태스크가 간격을 두고 묶어서 수행)"""
+        if extra_status:
+            self._status_extra = extra_status
+        self._status_dirty.set()
+
+    async def _status_updater(self) -> None:
+        """상태 메시지 갱신 태스크 (UPDATE_INTERVAL 동안 쌓인 변경을 한 번의 편집으로 반영)"""
+        while True:
+            await self._status_dirty.wait()
+            self._status_dirty.clear()
+            extra_status, self._status_extra = self._status_extra, None
             embed = self._build_status_embed(extra_status)
-            await self.status_msg.edit(embed=embed)
-        except discord.HTTPException as e:
-            logger.warning(f"상태 업데이트 실패: {e}")
+            if embed is None:
+                continue
+            try:
+                await self.status_msg.edit(embed=embed)
+            except discord.HTTPException as e:
+                logger.warning("상태 업데이트 실패: %s", e)
+            await asyncio.sleep(self.UPDATE_INTERVAL)
+
+    async def _stop_status_updater(self) -> None:
+        """상태 갱신 태스크 종료"""
+        task, self._status_task = self._status_task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
 
-    def _build_status_embed(self, extra_status: str = None) -> discord.Embed:
-        """상태 임베드"""
+    def _build_status_embed(self, extra_status: str = None) -> Optional[discord.Embed]:
+        """상태 임베드 (세션당 하나를 재사용해 필드 값만 교체, 표시 내용이 같으면 None)"""
         status = self._get_status_text(extra_status)
+
+        # 경과 시간만 바뀐 경우는 편집할 필요 없음 (미리보기 문자열을 합치기 전에 판단)
+        key = (status, self._state.content.version)
+        if key == self._last_status_key:
+            return None
+        self._last_status_key = key
         preview = self._get_content_preview()
 
-        embed = discord.Embed(
-            title="🔄 Claude Code 실행 중...",
-            color=discord.Color.yellow()
-        )
-        embed.add_field(name="상태", value=status, inline=True)
-        embed.add_field(name="경과", value=f"{self.elapsed_seconds:.1f}초", inline=True)
+        embed = self._status_embed
+        embed.set_field_at(0, name="상태", value=status, inline=True)
+        embed.set_field_at(1, name="경과", value=f"{self.elapsed_seconds:.1f}초", inline=True)
 
+        has_preview = len(embed.fields) > 2
         if preview.strip():
-            embed.add_field(
-                name="실시간 출력",
-                value=f"```\n{preview[:1000]}\n```",
-                inline=False
-            )
+            value = f"```\n{preview[:1000]}\n```"
+            if has_preview:
+                embed.set_field_at(2, name="실시간 출력", value=value, inline=False)
+            else:
+                embed.add_field(name="실시간 출력", value=value, inline=False)
+        elif has_preview:
+            embed.remove_field(2)
 
         return embed
 
@@ -575,7 +877,7 @@ class ClaudeSession:
         return "💭 응답 생성 중..."
 
     def _get_content_preview(self, max_length: int = 800) -> str:
-        content = self._state.current_content
+        content = self._state.content
         if len(content) > max_length:
-            return "...\n" + content[-max_length:]
-        return content
+            return "...\n" + content.last(max_length)
+        return content.tail
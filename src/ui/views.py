@@ -36,12 +36,7 @@ class PermissionView(ui.View):
     ) -> None:
         """단일 허용"""
         self.response = "allow"
-        await interaction.response.send_message(
-            f"✅ `{self.tool_name}` 허용됨",
-            ephemeral=True
-        )
-        await self._on_response(True, False)
-        self.stop()
+        await self._resolve(interaction, f"✅ `{self.tool_name}` 허용됨", True, False)
 
     @ui.button(label="❌ 거부", style=discord.ButtonStyle.danger)
     async def deny_button(
@@ -51,12 +46,7 @@ class PermissionView(ui.View):
     ) -> None:
         """거부"""
         self.response = "deny"
-        await interaction.response.send_message(
-            f"❌ `{self.tool_name}` 거부됨",
-            ephemeral=True
-        )
-        await self._on_response(False, False)
-        self.stop()
+        await self._resolve(interaction, f"❌ `{self.tool_name}` 거부됨", False, False)
 
     @ui.button(label="🔓 모두 허용", style=discord.ButtonStyle.primary)
     async def allow_all_button(
@@ -66,11 +56,26 @@ class PermissionView(ui.View):
     ) -> None:
         """세션 내 모든 권한 허용"""
         self.response = "allow_all"
-        await interaction.response.send_message(
-            "🔓 이 세션의 모든 권한 허용됨",
-            ephemeral=True
-        )
-        await self._on_response(True, True)
+        await self._resolve(interaction, "🔓 이 세션의 모든 권한 허용됨", True, True)
+
+    async def _resolve(
+        self,
+        interaction: discord.Interaction,
+        result: str,
+        allowed: bool,
+        allow_all: bool
+    ) -> None:
+        """요청 메시지를 결과로 편집하고 버튼 제거 (별도 안내 메시지 없이 응답 한 번으로 처리)"""
+        message = interaction.message
+        if message and message.embeds:
+            embed = message.embeds[0]
+        else:
+            embed = discord.Embed(title="🔐 권한 요청")
+        embed.color = discord.Color.green() if allowed else discord.Color.red()
+        embed.add_field(name="결과", value=result, inline=False)
+
+        await interaction.response.edit_message(embed=embed, view=None)
+        await self._on_response(allowed, allow_all)
         self.stop()
 
 